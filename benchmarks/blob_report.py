@@ -0,0 +1,69 @@
+# size and decode-time report of the stored blob formats, across a synthetic corpus of guilds
+# usage: python benchmarks/blob_report.py [guilds]
+import os
+import sys
+import json
+import time
+import random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config as c
+import sql_tools
+
+NAMES= ["Goomba", "Koopa", "Spiny", "Boo", "Bob-omb", "Shy Guy", "Pokey", "Lakitu"]
+STATS= ["HP", "FP", "POW", "DEF", "SPEED", "STACHE"]
+
+def move(rng: random.Random) -> dict:
+	return {"amount": str(rng.randint(0, 9)), "hits": str(rng.randint(1, 3)), "offense": rng.random() < 0.8, "type": rng.choice(["Ground", "Aerial", "Magic"]), "target": rng.choice(["One", "All", "Random"]), "stat": rng.choice(STATS)}
+
+def settings(rng: random.Random) -> dict:
+	moves= {"names": [f"Sticker {i}" for i in range(rng.randint(0, 30))]}
+	for i in range(len(moves["names"])):
+		moves[i]= dict(move(rng), info= "A custom sticker.", icon= "<:st_custom:1136186835069059243>", rarity= rng.choice(["Normal", "Shiny", "Flashy"]), cost= 0)
+	return {"mode": "sticker", "coins": rng.randint(0, 999), "hideHP": False, "luigi": True, "reward": {"items": ["HP"], "set": "All"}, "channel": str(rng.getrandbits(60)), "player": {"name": "Mario", "HP": 10, "FP": 5, "POW": 1, "DEF": 0, "SPEED": 0, "STACHE": 0}, "moves": moves}
+
+def battle(rng: random.Random) -> dict:
+	enemies= {"names": [rng.choice(NAMES) for i in range(rng.randint(1, 12))]}
+	for i in range(len(enemies["names"])):
+		moves= {"names": [f"Attack {j}" for j in range(rng.randint(1, 6))]}
+		for j in range(len(moves["names"])):
+			moves[j]= move(rng)
+		enemies[i]= {"HP": rng.randint(5, 99), "POW": rng.randint(1, 9), "DEF": rng.randint(0, 5), "SPEED": rng.randint(0, 9), "STACHE": rng.randint(0, 9), "spiny": rng.random() < 0.2, "flying": rng.random() < 0.2, "moves": moves}
+	phases= {"names": ["start"] + [f"t{i+2}" for i in range(rng.randint(0, 20))]}
+	for i in range(len(phases["names"])):
+		phases[i]= f"spawn:{rng.randint(1, len(enemies['names']))},{rng.randint(1, 3)}"
+	chars= {"names": ["Starlow", "Bowser"], 0: "https://example.com/starlow.png", 1: "https://example.com/bowser.png"}
+	events= [[[str(rng.randint(1, 2)), "Some dialogue line that goes on for a bit."] for j in range(rng.randint(1, 10))] for i in range(rng.randint(0, 5))]
+	return {"phases": phases, "enemies": enemies, "dialogue": {"chars": chars, "events": events}}
+
+def corpus(guilds: int) -> list[dict]:
+	rng= random.Random(7)
+	rows= []
+	for g in range(guilds):
+		rows.append(settings(rng))
+		for b in range(rng.randint(0, c.battle_slots)):
+			rows.append(battle(rng))
+	return rows
+
+if __name__ == "__main__":
+	guilds= int(sys.argv[1]) if len(sys.argv) > 1 else 500
+	rows= corpus(guilds)
+	print(f"{guilds} guilds, {len(rows)} rows")
+	print(f"{'format':<14}{'total KiB':>12}{'vs json':>10}{'decode ms':>12}")
+	base= None
+	for name in ["json", None, "zlib", "lzma"]:
+		if name == "json":
+			# the old storage format
+			blobs= [json.dumps(row) for row in rows]
+			label= "json (old)"
+		else:
+			c.db_compress= name
+			blobs= [sql_tools.encode(row) for row in rows]
+			label= name or "compact json"
+		size= sum(len(blob) for blob in blobs)
+		if base is None:
+			base= size
+		start= time.perf_counter()
+		for blob in blobs:
+			sql_tools.decode(blob)
+		elapsed= (time.perf_counter()-start)*1000
+		print(f"{label:<14}{size/1024:>12.0f}{size/base:>10.0%}{elapsed:>12.1f}")
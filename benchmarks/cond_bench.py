@@ -0,0 +1,110 @@
+# benchmark: per-action condition check cost of compiled phases (triggers.py) against the old regex cond_check, by number of phases
+# "indexed" only checks phases watching the turn and the enemy that was hit, like the battle loop does
+# usage: python benchmarks/cond_bench.py [actions]
+import os
+import re
+import sys
+import math
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import triggers
+from turns import Kind
+from slipper import jsonStr
+
+class Guy:
+	def __init__(self, id: int):
+		self.id= id
+		self.kind= Kind.PLAYER if id is None else Kind.ENEMY
+		self.HP= 10+(id or 0)
+		self.FP= 0
+		self.POW= 2
+		self.DEF= 1
+		self.SPEED= 3
+		self.STACHE= 4
+
+# the old check: regexes on every condition, every turn. results aren't run, only which phases are met
+def legacy(phases: dict, turn: float, lineup: list, enemies: list) -> list[int]:
+	out= []
+	for phase in range(len(phases)-1):
+		met= 0
+		conditions= phases["names"][phase].replace(" ", "")
+		for orcondition in conditions.split("|"):
+			orconditions= orcondition.split("&")
+			divisor= len(orconditions)
+			for condition in orconditions:
+				if condition.lower() == "start":
+					if not enemies:
+						met+= 1/divisor
+				elif re.findall(r"^[tT](?>[+]\d+|\d+)", condition):
+					comp= int(re.findall(r'\d+', condition)[0])
+					if comp == turn:
+						met+= 1/divisor
+					# (the old code used re.findall(r'+'), which doesn't compile)
+					elif re.findall(r'\+', condition):
+						if turn % comp == 0:
+							met+= 1/divisor
+				elif re.findall(r"(?i:^e\d(?>[<>]=|[=<>])(?>\d{1,2})(?>hp|fp|pow|def|speed|stache))", condition):
+					nums= re.findall(r'\d+', condition)
+					for guy in lineup:
+						if hasattr(guy, "id"):
+							if guy.id == int(nums[0])-1:
+								stat= int(getattr(guy, re.findall(r'\D+$', condition)[0].upper()))
+								break
+							else:
+								stat= None
+					if stat:
+						operand= re.findall(r'[<>]=|[=<>]', condition)[0]
+						check= {"=": stat == int(nums[1]), ">": stat > int(nums[1]), "<": stat < int(nums[1]), ">=": stat >= int(nums[1]), "<=": stat <= int(nums[1])}[operand]
+						if check:
+							met+= 1/divisor
+			met= bool(math.floor(met))
+			if met:
+				break
+		if met:
+			out.append(phase)
+	return out
+
+def compiled(phases: list, turn: float, lineup: list, enemies: list) -> list[int]:
+	state= triggers.State(turn, not enemies, lineup)
+	return [phase.index for phase in phases if phase.met(state)]
+
+def indexed(index: triggers.PhaseIndex, turn: float, lineup: list, enemies: list) -> list[int]:
+	index.mark("turn", turn%9)
+	state= triggers.State(turn, not enemies, lineup)
+	return [phase.index for phase in index.due() if phase.met(state)]
+
+MIXED= ["start", "t+{k}", "e{e}>={k}hp", "e{e}<5def&t+3", "t{k}|e{e}=3speed"]
+# scripted boss fights: mostly enemy stat thresholds
+STATS= ["e{e}>={k}hp", "e{e}<{k}hp", "e{e}=3speed", "e{e}<=5def", "t+{k}"]
+
+# a battle with n phases of the given condition kinds
+def battle(n: int, kinds: list[str]) -> dict:
+	phases= {"names": []}
+	for i in range(n):
+		phases["names"].append(kinds[i%len(kinds)].format(k= i%7+2, e= i%9+1))
+		phases[i]= "sys:hi"
+	return {"phases": phases, "enemies": {"names": []}}
+
+if __name__ == "__main__":
+	turns= int(sys.argv[1]) if len(sys.argv) > 1 else 200
+	lineup= [Guy(None)]+[Guy(i) for i in range(9)]
+	enemies= list(range(1, 10))
+	for title, kinds in [("mixed conditions", MIXED), ("stat conditions", STATS)]:
+		print(title)
+		print("phases |  legacy/action | compiled/action | indexed/action")
+		for n in [5, 20, 50, 100, 200, 500]:
+			data= battle(n, kinds)
+			# the engine reads collections as NamedList
+			phases, errors= triggers.compile_phases(jsonStr(data))
+			assert not errors, errors
+			for turn in range(1, 20):
+				assert legacy(data["phases"], turn, lineup, enemies) == compiled(phases, turn, lineup, enemies)
+			index= triggers.PhaseIndex(phases)
+			index.due()
+			times= []
+			for func, arg in [(legacy, data["phases"]), (compiled, phases), (indexed, index)]:
+				start= time.perf_counter()
+				for turn in range(turns):
+					func(arg, turn, lineup, enemies)
+				times.append((time.perf_counter()-start)/turns)
+			print(f"{n:>6} | {times[0]*1e6:>12.1f}us | {times[1]*1e6:>13.1f}us | {times[2]*1e6:>12.1f}us")
@@ -0,0 +1,68 @@
+# micro-benchmark: pooled StDbAccess vs. the old connect-per-call path
+# usage: python benchmarks/db_bench.py [ops]
+import os
+import sys
+import json
+import time
+import sqlite3
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from slipper import jsonStr
+from sql_tools import StDbAccess
+
+# the old access path: connect, create table, commit and close on every call
+class LegacyDbAccess():
+	def __init__(self, filename: str= None):
+		self.path= filename
+
+	def connect(self):
+		self.conn = sqlite3.connect(self.path)
+		self.conn.execute("CREATE TABLE IF NOT EXISTS server_data (guild_id numeric unique, settings text, b0 text, b1 text, b2 text, b3 text, b4 text)")
+
+	def close(self):
+		self.conn.commit()
+		self.conn.close()
+
+	def get1(self, id: str):
+		self.connect()
+		item = self.conn.execute('SELECT settings FROM server_data WHERE guild_id = ?', (id,)).fetchone()
+		self.close()
+		if item and item[0]:
+			return jsonStr(item[0])
+		return None
+
+	def set1(self, id: str, obj):
+		self.connect()
+		self.conn.execute('INSERT OR IGNORE INTO server_data (guild_id) VALUES (?)', (id,))
+		self.conn.execute('UPDATE server_data SET settings=? WHERE guild_id=?', (obj, id))
+		self.close()
+
+SETTINGS= {"mode": "sticker", "coins": 100, "hideHP": False, "luigi": True, "reward": {"items": ["HP"], "set": "All"}, "channel": "", "player": {"name": "Mario", "HP": 10, "FP": 5, "POW": 1, "DEF": 0, "SPEED": 0, "STACHE": 0}, "moves": {"names": []}}
+
+# run func ops times, return ops/sec
+def rate(func, ops: int) -> float:
+	start= time.perf_counter()
+	for i in range(ops):
+		func(i)
+	return ops/(time.perf_counter()-start)
+
+def run(db, ops: int, guilds: int= 50) -> dict:
+	blob= json.dumps(SETTINGS)
+	for g in range(guilds):
+		db.set1(g, blob)
+	return {
+		"read": rate(lambda i: db.get1(i % guilds), ops),
+		"write": rate(lambda i: db.set1(i % guilds, blob), ops)
+	}
+
+if __name__ == "__main__":
+	ops= int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+	with tempfile.TemporaryDirectory() as tmp:
+		legacy= run(LegacyDbAccess(os.path.join(tmp, "legacy.db")), ops)
+		pooled_db= StDbAccess(os.path.join(tmp, "pooled.db"))
+		pooled= run(pooled_db, ops)
+		pooled_db.close()
+	print(f"{'path':<10}{'read ops/s':>14}{'write ops/s':>14}")
+	print(f"{'legacy':<10}{legacy['read']:>14.0f}{legacy['write']:>14.0f}")
+	print(f"{'pooled':<10}{pooled['read']:>14.0f}{pooled['write']:>14.0f}")
+	print(f"speedup: read x{pooled['read']/legacy['read']:.1f}, write x{pooled['write']/legacy['write']:.1f}")
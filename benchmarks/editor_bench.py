@@ -0,0 +1,42 @@
+# benchmark: cost of one editor interaction (edit a move, refresh the panel, show the current page) by move pool size,
+# cached lazy pages against rendering every page like before
+# usage: python benchmarks/editor_bench.py [edits]
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from session import EditorSession
+from slipper import NamedList
+from interface.gen_comp import MovePanel
+
+MOVE= {"info": "Hits hard.", "icon": "🔨", "amount": 1, "hits": 1, "cost": 0, "offense": True, "rarity": "Normal", "type": "Ground", "target": "One", "stat": "HP"}
+
+def pool(n: int) -> NamedList:
+	return NamedList([f"Move {i}" for i in range(n)], [dict(MOVE) for i in range(n)])
+
+# edits one move per interaction, on the page being shown
+def run(panel: MovePanel, edits: int, old: bool) -> float:
+	moves= panel.session.moves
+	n= len(moves)
+	start= time.perf_counter()
+	for edit in range(edits):
+		page= edit % n
+		moves[page]["amount"]= edit % 10
+		panel.onEdit()
+		if old:
+			# the old onEdit built every page
+			pages= [panel.render(*item) for item in panel.embeds.items]
+		else:
+			pages= panel.embeds
+		pages[page]
+	return (time.perf_counter()-start)/edits
+
+if __name__ == "__main__":
+	edits= int(sys.argv[1]) if len(sys.argv) > 1 else 200
+	print("moves | all pages | cached pages")
+	for n in (10, 100, 1000):
+		session= EditorSession("bench", {"mode": "sticker", "moves": pool(n)})
+		panel= MovePanel(session)
+		old= run(panel, edits, True)
+		new= run(panel, edits, False)
+		print(f"{n:>5} | {old*1e3:>6.2f} ms | {new*1e3:>6.3f} ms")
@@ -0,0 +1,61 @@
+# benchmark: slipper.jsonStr against the old regex-based decoder, on large battle blobs
+# usage: python benchmarks/json_bench.py [enemies] [runs]
+import os
+import re
+import sys
+import json
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from slipper import jsonStr, jsonDump
+
+# the old decoder: regex on every key after json.loads, then rebuild every dict
+def legacy(obj) -> dict:
+	if not isinstance(obj, dict):
+		obj= json.loads(obj)
+	nObj= {}
+	for key, value in obj.items():
+		if re.findall(r"\d+", key):
+			nKey= int(key)
+		else:
+			nKey= key
+		if isinstance(value, dict):
+			nObj[nKey]= legacy(value)
+		else:
+			nObj[nKey]= value
+	return nObj
+
+# a battle with many enemies, moves, phases and characters
+def battle(enemies: int) -> str:
+	move= {"amount": "3", "hits": "2", "offense": True, "type": "Ground", "target": "One", "stat": "HP"}
+	enemy= {"HP": 20, "POW": 2, "DEF": 1, "SPEED": 3, "STACHE": 4, "spiny": False, "flying": True}
+	data= {
+		"enemies": {"names": [f"Goomba {i}" for i in range(enemies)]},
+		"phases": {"names": [f"t{i}" for i in range(enemies)]},
+		"dialogue": {"chars": {"names": ["Starlow"], 0: "https://example.com/a.png"}, "events": [[["1", "Hi!"]]*10]*10}
+	}
+	for i in range(enemies):
+		moves= {"names": [f"Move {j}" for j in range(20)]}
+		for j in range(20):
+			moves[j]= dict(move)
+		data["enemies"][i]= dict(enemy, moves= moves)
+		data["phases"][i]= f"spawn:{i%9+1},1"
+	return json.dumps(data)
+
+def timeit(func, blob: str, runs: int) -> float:
+	start= time.perf_counter()
+	for i in range(runs):
+		func(blob)
+	return (time.perf_counter()-start)/runs
+
+if __name__ == "__main__":
+	enemies= int(sys.argv[1]) if len(sys.argv) > 1 else 200
+	runs= int(sys.argv[2]) if len(sys.argv) > 2 else 20
+	blob= battle(enemies)
+	# same data: collections come back as NamedList, which write back to the same json
+	assert jsonDump(jsonStr(blob)) == json.dumps(legacy(blob))
+	old= timeit(legacy, blob, runs)
+	new= timeit(jsonStr, blob, runs)
+	print(f"blob: {len(blob)/1024:.0f} KiB, {enemies} enemies")
+	print(f"legacy jsonStr: {old*1000:.2f}ms")
+	print(f"object hook:    {new*1000:.2f}ms")
+	print(f"speedup: x{old/new:.1f}")
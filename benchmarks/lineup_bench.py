@@ -0,0 +1,117 @@
+# benchmark: memory and speed of large lineups built by spawn: events, slotted Being/Action against the old attribute bags
+# usage: python benchmarks/lineup_bench.py [enemies]
+import os
+import sys
+import time
+import tracemalloc
+from copy import deepcopy
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import btl_logic as btl
+from session import BattleSession
+from slipper import jsonStr
+
+# the old classes: per-instance dicts, deepcopied stats, one Action per move per spawned enemy
+class OldAction:
+	def __init__(self, obj: dict, name: str= None, id: int = 0):
+		self.id= id
+		self.name= name
+		if obj.get('info'):
+			self.info= obj['info']
+		self.type= obj['type']
+		self.amount= obj['amount']
+		self.hits= obj['hits']
+		if obj.get('cost'):
+			self.cost= obj['cost']
+		self.offense= obj['offense']
+		self.target= obj['target']
+		self.stat= obj['stat']
+		if obj.get('rarity'):
+			self.rarity= obj['rarity']
+		if obj.get('icon'):
+			self.icon= obj['icon']
+		self.scripted= obj.get('scripted')
+
+class OldBeing:
+	def __init__(self, obj: dict, name: str = None, mode: str = None):
+		self.name= name
+		self.maxHP= obj["HP"]
+		self.HP= deepcopy(self.maxHP)
+		if obj.get("FP"):
+			self.maxFP= obj["FP"]
+			self.FP= deepcopy(self.maxFP)
+		self.setPOW= obj["POW"]
+		self.POW= deepcopy(self.setPOW)
+		self.setDEF= obj["DEF"]
+		self.DEF= deepcopy(self.setDEF)
+		self.setSPEED= obj["SPEED"]
+		self.SPEED= deepcopy(self.setSPEED)
+		self.setSTACHE= obj["STACHE"]
+		self.STACHE= deepcopy(self.setSTACHE)
+		if self.__class__.__name__ == "Player" and mode == "fp" or self.__class__.__name__ == "Enemy" and len(obj["moves"])-1:
+			self.moves= []
+			for i in range(len(obj["moves"])-1):
+				self.moves.append(OldAction(name= obj["moves"]["names"][i], obj= obj["moves"][i]))
+		else:
+			self.moves= {}
+
+class Enemy(OldBeing):
+	def __init__(self, s: BattleSession, id: int):
+		obj= s.battle["enemies"][id]
+		super().__init__(obj, s.battle["enemies"]["names"][id])
+		self.id= id
+		self.spiny= obj['spiny']
+		self.flying= obj['flying']
+
+# a battle with a few enemy kinds, four moves each. legacy keeps the old {"names": [...], 0: ...} layout the old classes read
+def session(legacy: bool) -> BattleSession:
+	move= {"amount": "3", "hits": "2", "offense": True, "type": "Ground", "target": "One", "stat": "HP"}
+	enemy= {"HP": "20", "POW": "2", "DEF": "1", "SPEED": "3", "STACHE": "4", "spiny": False, "flying": True,
+		"moves": {"names": ["Bonk", "Tackle", "Headbutt", "Stomp"], 0: move, 1: move, 2: move, 3: move}}
+	s= BattleSession("0")
+	s.battle= {"enemies": {"names": [f"Goomba {i}" for i in range(5)]}}
+	for i in range(5):
+		s.battle["enemies"][i]= enemy
+	if not legacy:
+		s.battle= jsonStr(s.battle)
+	return s
+
+# spawn n enemies, returns (seconds, bytes held)
+def spawn(cls, n: int) -> tuple[float, int, list]:
+	s= session(cls is Enemy)
+	tracemalloc.start()
+	start= time.perf_counter()
+	lineup= [cls(s, i%5) for i in range(n)]
+	took= time.perf_counter()-start
+	size= tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	return took, size, lineup
+
+# the battle loop's per-round pass over the lineup: split enemies from the player and sum speeds
+def old_pass(lineup: list) -> int:
+	total= 0
+	for guy in lineup:
+		if guy.__class__.__name__ == "Enemy":
+			total+= int(guy.SPEED)
+	return total
+
+def new_pass(lineup: list) -> int:
+	total= 0
+	for guy in lineup:
+		if guy.kind is btl.Kind.ENEMY:
+			total+= guy.SPEED
+	return total
+
+def timeit(func, lineup: list, runs: int= 20) -> float:
+	start= time.perf_counter()
+	for i in range(runs):
+		func(lineup)
+	return (time.perf_counter()-start)/runs
+
+if __name__ == "__main__":
+	n= int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+	oldTime, oldSize, oldLineup= spawn(Enemy, n)
+	newTime, newSize, newLineup= spawn(btl.Enemy, n)
+	assert old_pass(oldLineup) == new_pass(newLineup)
+	print(f"{n} spawned enemies")
+	print(f"old:     {oldSize/n:.0f} B/enemy, spawn {oldTime*1e6/n:.2f}us/enemy, lineup pass {timeit(old_pass, oldLineup)*1000:.2f}ms")
+	print(f"slotted: {newSize/n:.0f} B/enemy, spawn {newTime*1e6/n:.2f}us/enemy, lineup pass {timeit(new_pass, newLineup)*1000:.2f}ms")
@@ -0,0 +1,39 @@
+# loop-lag gauge with many concurrent battles pacing on the shared timer service
+# usage: python benchmarks/loop_lag.py [battles] [seconds]
+import os
+import sys
+import time
+import random
+import asyncio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import timers
+
+# a battle: vote windows, pacing between hit messages, a bit of rules work per action
+async def battle(rng: random.Random, until: float, blocking: bool):
+	while time.perf_counter() < until:
+		# vote window
+		await timers.deadline(rng.uniform(0.1, 0.5))
+		# rules work
+		sum(i*i for i in range(200))
+		# pacing
+		if blocking:
+			time.sleep(0.01)
+		else:
+			await timers.sleep(0.3)
+
+async def run(battles: int, seconds: float, blocking: bool= False) -> dict:
+	timers.scheduler= timers.StScheduler()
+	timers.scheduler.start_monitor(0.05)
+	rng= random.Random(1)
+	until= time.perf_counter()+seconds
+	await asyncio.gather(*[battle(rng, until, blocking) for i in range(battles)])
+	timers.scheduler.monitor.cancel()
+	return timers.scheduler.stats()
+
+if __name__ == "__main__":
+	battles= int(sys.argv[1]) if len(sys.argv) > 1 else 100
+	seconds= float(sys.argv[2]) if len(sys.argv) > 2 else 3
+	stats= asyncio.run(run(battles, seconds))
+	print(f"{battles} battles on the timer service: lag {stats['lag_ms']:.2f}ms avg, {stats['peak_ms']:.2f}ms peak, {stats['fired']} timers")
+	stats= asyncio.run(run(battles, seconds, True))
+	print(f"{battles} battles with time.sleep(0.01) pacing: lag {stats['lag_ms']:.2f}ms avg, {stats['peak_ms']:.2f}ms peak, {stats['fired']} timers")
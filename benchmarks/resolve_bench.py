@@ -0,0 +1,65 @@
+# benchmark: action applications per second of resolve.StatBlock, numpy against the pure-Python fallback (and a check that both agree)
+# usage: python benchmarks/resolve_bench.py [battles] [steps]
+import os
+import sys
+import time
+import random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import resolve
+from btl_logic import Action
+
+MOVES= [
+	Action({"amount": 0, "hits": 2, "offense": True, "type": "Aerial", "target": "One", "stat": "HP"}, "Jump"),
+	Action({"amount": 1, "hits": 1, "offense": True, "type": "Ground", "target": "One", "stat": "HP"}, "Hammer"),
+	Action({"amount": 10, "hits": 1, "offense": False, "type": "Magic", "target": "One", "stat": "HP"}, "Mushroom"),
+	Action({"amount": 2, "hits": 1, "offense": True, "type": "Magic", "target": "All", "stat": "DEF"}, "Chill"),
+]
+
+# a player and 4 enemies per battle
+def block(battles: int, rng: random.Random) -> resolve.StatBlock:
+	n= battles*5
+	stats= {name: [rng.randint(0, 5) for i in range(n)] for name in resolve.STATS}
+	stats["HP"]= [rng.randint(10, 40) for i in range(n)]
+	stats["maxHP"]= [hp+rng.randint(0, 10) for hp in stats["HP"]]
+	stats["maxFP"]= stats["FP"]
+	return resolve.StatBlock(stats)
+
+# steps of (move, targets, pow, blocked), one application per battle each
+def script(battles: int, steps: int, rng: random.Random) -> list:
+	out= []
+	for step in range(steps):
+		targets= [i*5+rng.randrange(5) for i in range(battles)]
+		pow= [rng.randint(0, 5) for i in range(battles)]
+		blocked= [rng.random() < 0.5 for i in range(battles)]
+		out.append((rng.choice(MOVES), targets, pow, blocked))
+	return out
+
+def run(stats: resolve.StatBlock, steps: list) -> float:
+	start= time.perf_counter()
+	for move, targets, pow, blocked in steps:
+		stats.apply(move, targets, pow, blocked)
+	return time.perf_counter()-start
+
+if __name__ == "__main__":
+	battles= int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+	steps= int(sys.argv[2]) if len(sys.argv) > 2 else 20
+	rng= random.Random(0)
+	base= block(battles, rng)
+	steps= script(battles, steps, rng)
+	applications= battles*len(steps)
+	pythonStats= base.copy(numpy= False)
+	slow= run(pythonStats, steps)
+	print(f"{applications} applications")
+	print(f"python: {applications/slow/1e6:.2f}M/s")
+	if resolve.np is None:
+		print("numpy isn't installed, only the fallback ran")
+	else:
+		import numpy as np
+		numpyStats= base.copy(numpy= True)
+		# numpy wants arrays, the fallback lists
+		arrays= [(move, np.array(targets), np.array(pow), np.array(blocked)) for move, targets, pow, blocked in steps]
+		fast= run(numpyStats, arrays)
+		for name in resolve.STATS:
+			assert list(getattr(numpyStats, name)) == getattr(pythonStats, name), name
+		print(f"numpy:  {applications/fast/1e6:.1f}M/s (results identical)")
+		print(f"speedup: x{slow/fast:.0f}")
@@ -1,101 +1,90 @@
+from __future__ import annotations
 import os
-import re
-import time
-import math
+import triggers
+import resolve
 import random
-import hikari
-import lightbulb
-import sql_tools
-import config as c
-from copy import deepcopy
-from slipper import jsonStr, num_to_list
+from ports import Card
+from turns import TurnQueue, Kind
+from typing import TYPE_CHECKING
+from types import MappingProxyType
+from slipper import NamedList, jsonStr
+if TYPE_CHECKING:
+	from session import BattleSession
+# battle rules. no Discord here: everything players see or decide goes through s.port (see ports.py)
 
 # the Action class defines what battle actions do. Actions can consist of attacks, stickers, moves that cost FP, and items.
 class Action:
+	__slots__= ("id", "name", "info", "type", "amount", "hits", "cost", "offense", "target", "stat", "rarity", "icon", "scripted")
+
 	def __init__(self, obj: dict, name: str= None, id: int = 0):
 		# action id
 		self.id= id
 		# is shown in battle as an option/the opposing party’s attack.
 		self.name= name
 		# description. Unnecessary for enemies.
-		if obj.get('info'):
-			self.info= obj['info']		
+		self.info= obj.get('info', "")
 		# action type. Options: "Ground", "Aerial", "Magic"
 		self.type= obj['type']
 		# how much value is reduced/increased.
-		self.amount= obj['amount']
+		self.amount= int(obj['amount'])
 		# times an action hits
-		self.hits= obj['hits']
+		self.hits= int(obj['hits'])
 		# FP cost of the action. FP isn’t required.
-		if obj.get('cost'):
-			self.cost= obj['cost']
+		self.cost= int(obj.get('cost') or 0)
 		# a bool that specifies if the action is offensive.
-		self.offense= obj['offense']
+		self.offense= bool(obj['offense'])
 		# action target. options: "One, All, Random"
 		self.target= obj['target']
 		# a string that specifies which stat changes. Options: "HP, FP, POW, DEF, SPEED, STACHE"
 		self.stat= obj['stat']
 		# likelihood of spawning. Options: "Normal, Shiny, Flashy"
-		if obj.get('rarity'):
-			self.rarity= obj['rarity']
+		self.rarity= obj.get('rarity')
 		# reaction emote
-		if obj.get('icon'):
-			self.icon= obj['icon']
+		self.icon= obj.get('icon')
 		# defines whether an Action will be performed only after a condition is met.
 		self.scripted= obj.get('scripted')
 
 	# deploy the action
-	async def deploy_action(self, target, sender = None, blocked: bool = False):
+	async def deploy_action(self, s: BattleSession, target, sender = None, blocked: bool = False):
+		operator= "-" if self.offense else "+"
+		# (target, damage/gain per hit)
+		results= []
 		for person in target:
 			stat= getattr(person, self.stat)
 			# check for wrong outcomes
-			embed= c.StEmbed(title= "")
-			if hasattr(person, "spiny"):
-				if self.type == "Aerial" and person.spiny:
-					person.HP-=1
-					embed.title= f"{sender.name} got hurt by spines!"
-					embed.description= "-1HP"
-			if hasattr(person, "flying"):
-				if self.type == "Ground" and person.flying:
-					embed.title= f"{sender.name} can't reach!"
+			embed= Card(title= "")
+			if self.type == "Aerial" and person.spiny:
+				person.HP-=1
+				embed.title= f"{sender.name} got hurt by spines!"
+				embed.description= "-1HP"
+			if self.type == "Ground" and person.flying:
+				embed.title= f"{sender.name} can't reach!"
 			if person.STACHE == random.random():
 				embed.title= f"{sender.name} missed!"
 			if embed.title:
-				await c.channel.send(embed)
+				await s.port.show(embed)
 				return
 			
-			# calculate damage
+			# calculate damage (see resolve.py)
 			if self.offense:
-				# if player blocked
-				if blocked:
-					b= 0.5
-				else:
-					b= 1
 				# if sender exists
 				if sender:
-					pow= int(sender.POW)
+					pow= sender.POW
 				else:
 					pow= 0
-				dmg= round((pow + int(self.amount) - int(person.DEF))*b)
-				operator= "-"
+				dmg= resolve.damage(pow, self.amount, person.DEF, blocked)
 				# set stat value
-				setattr(person, self.stat, int(stat)-dmg*int(self.hits))
+				setattr(person, self.stat, stat-dmg*self.hits)
 			else:
-				dmg= int(self.amount)
-				operator= "+"
-				calc= int(stat)+dmg*int(self.hits)
-				# set stat value
-				if self.stat == 'HP' or self.stat == 'FP':
-					max= getattr(person, f"max{self.stat}")
-					if calc > max:
-						result= max
-					else:
-						result= calc
-				else:
-					result= calc
-				setattr(person, self.stat, result)
+				dmg= self.amount
+				# HP/FP are capped at their max
+				cap= resolve.CAPPED.get(self.stat)
+				setattr(person, self.stat, resolve.restore(stat, dmg*self.hits, getattr(person, cap) if cap else None))
+			results.append((person, dmg))
+		if not results:
+			return
 		# set up response
-		embed= c.StEmbed(description= "")
+		embed= Card(description= "")
 		if self.target == "All":
 			name= "all enemies"
 		else:
@@ -104,52 +93,174 @@ class Action:
 			embed.title= f"{sender.name}: {self.name} -> {name}."
 		else:
 			embed.title= f"-> {name}."
-		# send result
-		for hit in range(int(self.hits)):
-			embed.description+= f"{operator}{dmg}{self.stat}\n"
-			if hit == 0:
-				msg= await c.channel.send(embed)
-			else:
-				msg= await msg.edit(embed)
-			time.sleep(0.3)
+		# one line per hit, with every target on it. sent as one message (see Port.hits)
+		if len(results) == 1:
+			line= f"{operator}{results[0][1]}{self.stat}"
+		else:
+			line= ", ".join(f"{person.name} {operator}{dmg}{self.stat}" for person, dmg in results)
+		await s.port.hits(embed, [line]*self.hits)
+
+# sticker rarities, and each album's odds of drawing them (percent)
+RARITIES= ["Normal", "Shiny", "Flashy"]
+ALBUMS= {"Normal": [75, 20, 5], "Shiny": [50, 35, 15], "Flashy": [40, 35, 25]}
+
+# draws sticker ids with an album's odds: a rarity by the album's odds, then any sticker of that rarity.
+# flattened to cumulative weights per sticker, so k stickers are one random.choices call
+class StickerSampler:
+	def __init__(self, rarities: tuple, odds: list[int]):
+		counts= [rarities.count(rarity) for rarity in RARITIES]
+		self.ids= []
+		self.cum= []
+		total= 0
+		for id, rarity in enumerate(rarities):
+			if rarity in RARITIES:
+				i= RARITIES.index(rarity)
+				total+= odds[i]/counts[i]
+				self.ids.append(id)
+				self.cum.append(total)
+
+	def draw(self, k: int= 1) -> list[int]:
+		if not self.ids:
+			return []
+		return random.choices(self.ids, cum_weights= self.cum, k= k)
+
+# templates folder, next to this file
+TEMPLATES= os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+# read-only moves of one template file. Actions are built once and shared by every battle
+class MoveSet:
+	def __init__(self, path: str):
+		self.path= path
+		self.mtime= os.stat(path).st_mtime_ns
+		with open(path) as f:
+			data= jsonStr(f.read())
+		self.names= tuple(data.names)
+		self.moves= tuple(MappingProxyType(move) for move in data)
+		self.actions= tuple(Action(move, name) for move, name in zip(self.moves, self.names))
+		self.rarities= tuple(move.get("rarity") for move in self.moves)
+		# (custom move rarities, album) -> StickerSampler. dropped with the MoveSet when the template changes
+		self.samplers= {}
+
+	def __len__(self) -> int:
+		return len(self.names)
+
+	# sampler over these moves plus custom moves of the given rarities
+	def sampler(self, custom: tuple, album: str) -> StickerSampler:
+		key= (custom, album)
+		sampler= self.samplers.get(key)
+		if sampler is None:
+			# one entry per distinct custom move set, oldest dropped first
+			if len(self.samplers) >= 256:
+				self.samplers.pop(next(iter(self.samplers)))
+			sampler= self.samplers[key]= StickerSampler(self.rarities+custom, ALBUMS[album])
+		return sampler
+
+# process-wide template moves, loaded once. a template is re-read only when its file changes
+class MoveCatalog:
+	def __init__(self, folder: str= TEMPLATES):
+		self.folder= folder
+		self.sets= {}
+
+	# name: template file name without .json ("basic", "special")
+	def get(self, name: str) -> MoveSet:
+		path= os.path.join(self.folder, f"{name}.json")
+		moves= self.sets.get(name)
+		if moves is None or os.stat(path).st_mtime_ns != moves.mtime:
+			moves= MoveSet(path)
+			self.sets[name]= moves
+		return moves
+
+	# load every template up front
+	def load(self):
+		for name in ["basic", "special"]:
+			self.get(name)
+
+catalog= MoveCatalog()
+
+# a guild's stickers: the shared special moves, then its custom moves. the base is never copied
+class GuildMoves:
+	def __init__(self, base: MoveSet, custom: NamedList):
+		self.base= base
+		self.custom= custom
+		# custom move names/Actions, ids continue after the base
+		self.names= custom.names
+		self.actions= tuple(Action(move, name) for name, move in custom.items())
+		# samplers are shared by guilds whose custom moves have the same rarities
+		self.rarities= tuple(move.get("rarity") for move in custom)
+
+	def __len__(self) -> int:
+		return len(self.base)+len(self.names)
+
+	# sticker sampler with an album's odds ("Normal", "Shiny", "Flashy")
+	def sampler(self, album: str) -> StickerSampler:
+		return self.base.sampler(self.rarities, album)
+
+	# move data by sticker id
+	def __getitem__(self, id: int) -> dict:
+		if id < len(self.base):
+			return self.base.moves[id]
+		return self.custom[id-len(self.base)]
+
+	def name(self, id: int) -> str:
+		if id < len(self.base):
+			return self.base.names[id]
+		return self.names[id-len(self.base)]
+
+	def action(self, id: int) -> Action:
+		if id < len(self.base):
+			return self.base.actions[id]
+		return self.actions[id-len(self.base)]
 
 # the Being class defines the player character, party members, or enemies. It stores their basic stats.
 class Being:
+	__slots__= ("name", "id", "uid", "maxHP", "HP", "maxFP", "FP", "setPOW", "POW", "setDEF", "DEF", "setSPEED", "SPEED", "setSTACHE", "STACHE", "spiny", "flying", "moves")
+	# set by subclasses
+	kind= None
+
 	def __init__(self, obj: dict, name: str = None):
 		# the Being’s name.
 		self.name= name
+		# enemy id (the enemy's index in the battle). None for the player
+		self.id= None
+		# combatant id, set when it joins the turn queue (see turns.py)
+		self.uid= None
 		# max health points. HP is set to this on init, unless special exception occurs.
-		self.maxHP= obj["HP"]
-		self.HP= deepcopy(self.maxHP)
+		self.maxHP= int(obj["HP"])
+		self.HP= self.maxHP
 		# same as maxHP but FP for special attacks/max sticker cap.
-		if obj.get("FP"):
-			self.maxFP= obj["FP"]
-			self.FP= deepcopy(self.maxFP)
+		self.maxFP= int(obj.get("FP") or 0)
+		self.FP= self.maxFP
 		# set attack power. can flucutate in a battle, and if temporary- value resets to setPOW.
-		self.setPOW= obj["POW"]
-		self.POW= deepcopy(self.setPOW)
+		self.setPOW= int(obj["POW"])
+		self.POW= self.setPOW
 		# same as setPOW, but for defense.
-		self.setDEF= obj["DEF"]
-		self.DEF= deepcopy(self.setDEF)
+		self.setDEF= int(obj["DEF"])
+		self.DEF= self.setDEF
 		# same as setPOW, but determines turn order. Without speed, player starts.
-		self.setSPEED= obj["SPEED"]
-		self.SPEED= deepcopy(self.setSPEED)
+		self.setSPEED= int(obj["SPEED"])
+		self.SPEED= self.setSPEED
 		# same as setPOW, but determines chance of lucky hits, and may increase store discounts.
-		self.setSTACHE= obj["STACHE"]
-		self.STACHE= deepcopy(self.setSTACHE)
-		# moves is an array of Actions/Action IDs.
-		if self.__class__.__name__ == "Player" and c.save["mode"] == "fp" or self.__class__.__name__ == "Enemy" and len(obj["moves"])-1:
-			self.moves= []
-			for i in range(len(obj["moves"])-1):
-				self.moves.append(Action(name= obj["moves"]["names"][i], obj= obj["moves"][i]))
-		else:
-			self.moves= {}
-			
+		self.setSTACHE= int(obj["STACHE"])
+		self.STACHE= self.setSTACHE
+		# spiny: the player can't jump on it. flying: the player can't hammer it.
+		self.spiny= False
+		self.flying= False
+		# moves is an array of Actions, or sticker id -> count for the player in sticker mode.
+		self.moves= {}
+
 	# adds an Action to self.moves
 	def add_move(self, obj: Action):
 		self.moves.append(obj)
 
 class Player(Being):
+	__slots__= ()
+	kind= Kind.PLAYER
+
+	def __init__(self, obj: dict, name: str = None, mode: str = None):
+		super().__init__(obj, name)
+		if mode == "fp":
+			self.moves= [Action(name= name, obj= move) for name, move in obj["moves"].items()]
+
 	# adds a sticker
 	def add_sticker(self, id: int):
 		if not self.FP+1 == 0:
@@ -160,437 +271,288 @@ class Player(Being):
 			self.FP-= 1
 
 	# fill sticker inventory with randoms
-	async def sticker_roulette(self, ctx: lightbulb.Context, rMoves: list[dict]):
-		if c.save["coins"] >= 50:
+	async def sticker_roulette(self, s: BattleSession):
+		if s.save["coins"] >= 50:
 			emojis= ['1️⃣']
 			desc= "Choose an album to use for the battle!\n1️⃣ **Normal Album-** 50 coins."
-			if c.save["coins"] >= 100:
+			if s.save["coins"] >= 100:
 				emojis.append('2️⃣')
 				desc+= "\n2️⃣ **Shiny Album-** 100 coins."
-			if c.save["coins"] >= 200:
+			if s.save["coins"] >= 200:
 				emojis.append('3️⃣')
 				desc+= "\n3️⃣ **Flashy Album-** 200 coins."
 			emojis.append('❌')
 			desc+= "\n❌ **Don't buy.**"
-			embed= (
-				c.StEmbed(title="Album Shop", description= desc)
-				.set_footer(f'{c.save["coins"]} coins')
-			)
-			msg= await c.channel.send(embed= embed)
-			choice= await react_count(ctx.app.rest, msg, emojis)
+			embed= Card(title="Album Shop", description= desc, footer= f'{s.save["coins"]} coins')
+			choice= await s.port.choose(embed, emojis)
 			# message to send
-			txt= ""
+			txt= "Bought nothing."
+			album= None
 			# modify according to choice
 			if choice.emoji == '3️⃣':
-				c.save["coins"]-= 200
-				txt+= "Bought Flashy Album."
-				# percentages
-				chance= [40, 35, 25]
+				s.save["coins"]-= 200
+				album= "Flashy"
 			elif choice.emoji == '2️⃣':
-				c.save["coins"]-= 100
-				txt+= "Bought Shiny Album."
-				chance= [50, 35, 15]
+				s.save["coins"]-= 100
+				album= "Shiny"
 			elif choice.emoji == '1️⃣':
-				c.save["coins"]-= 50
-				txt+= "Bought Normal Album."
-				chance= [75, 20, 5]
-			elif choice.emoji == '❌':
-				txt+= "Bought nothing."
-				chance= None
+				s.save["coins"]-= 50
+				album= "Normal"
 			# pick random stickers
-			if chance:
-				for num in range(c.save["player"]["FP"]):
-					x= random.choices(range(3), chance)[0]
-					move= random.choice(list(rMoves[x]))
+			if album:
+				txt= f"Bought {album} Album."
+				for move in s.moves.sampler(album).draw(s.save["player"]["FP"]):
 					self.add_sticker(move)
 				# save coin amount to db
-				sql_tools.saveID(ctx.guild_id, c.save)
+				await s.port.save()
 		else:
 			txt= "Not enough coins to buy from the album shop!"
-		await c.channel.send(txt)
+		await s.port.show(txt)
 
 # defines enemies in battle
 class Enemy(Being):
-	def __init__(self, id: int):
-		obj= c.battle["enemies"][id]
-		super().__init__(obj, c.battle["enemies"]["names"][id])
+	__slots__= ()
+	kind= Kind.ENEMY
+
+	def __init__(self, s: BattleSession, id: int):
+		obj= s.battle["enemies"][id]
+		super().__init__(obj, s.battle["enemies"].names[id])
 		# the Enemy's id
 		self.id= id
-		# spiny is a bool that determines whether the player can jump on the enemy(True= No, False= Yes).
-		self.spiny= obj['spiny']
-		# flying is a bool that determines whether the player can hammer the enemy(True= No, False= Yes).
-		self.flying= obj['flying']
-
-# reaction with id
-class Reactionish(hikari.Reaction):
-	def __init__(self):
-		self.count= 0
-		self.emoji= None
-		self.is_me= False
-		self.id= 0
-	# parse from hikari.Reaction
-	@classmethod
-	def parse(cls, obj: hikari.Reaction, custom_id: int= 0):
-		instance= cls()
-		instance.count= obj.count
-		instance.emoji= obj.emoji
-		instance.is_me= obj.is_me
-		instance.id= custom_id
-		return instance
-
-# count reactions
-async def react_count(rest: hikari.impl.RESTClientImpl, message: hikari.Message, emojis):
-	# add emoji reactions
-	for emoji in emojis:
-		await rest.add_reaction(message= message, channel= c.channel, emoji= hikari.Emoji.parse(emoji))
-	# set end time
-	end_time= time.time() + 30
-	max= Reactionish()
-	while end_time > time.time():
-		# update message info
-		message= await c.channel.fetch_message(message)
-		for i, reaction in enumerate(message.reactions):
-			# change chosen reaction
-			if reaction.count > max.count:
-				max= Reactionish.parse(reaction, i)
-			# if chosen reaction by 75% of participating members
-			if max.count-1 >= c.members*0.75:
-				return max
-		time.sleep(1)
-	return max
-
-# group moves from c.moves by rarity
-def group_rare() -> list[dict]:
-	moves= [{}, {}, {}]
-	for i in range(len(c.moves)-1):
-		for j, k in enumerate(["Normal", "Shiny", "Flashy"]):
-			if c.moves[i]["rarity"] == k:
-				moves[j].update({i: c.moves[i]})
-	return moves
+		self.spiny= bool(obj['spiny'])
+		self.flying= bool(obj['flying'])
+		# spawned copies share their Actions
+		self.moves= s.actions.get(id)
+		if self.moves is None:
+			self.moves= s.actions[id]= tuple(Action(name= name, obj= move) for name, move in obj["moves"].items())
 
 # get random sticker through normal odds
-async def random_sticker(player: Player, moves: list[int]) -> bool:
+async def random_sticker(s: BattleSession, player: Player) -> bool:
 	if player.FP == 0:
 		return False
-	x= random.choices(range(3), [75, 20, 5])[0]
-	id= random.choice(list(moves[x]))
+	ids= s.moves.sampler("Normal").draw()
+	if not ids:
+		return False
+	id= ids[0]
 	player.add_sticker(id)
-	await c.channel.send(c.StEmbed(description= f"**+1 {c.moves[id]['icon']}{c.moves['names'][id]}**"))
-	time.sleep(1)
+	await s.port.show(Card(description= f"**+1 {s.moves[id]['icon']}{s.moves.name(id)}**"))
+	await s.port.pause(1)
 	return True
 
 # condition check and result execution
-async def cond_check(ctx: lightbulb.Context, turn: int, lineup: list[Being], enemies: list[int], player: int):
-	for phase in range(len(c.battle['phases'])-1):
-		met= 0
-		conditions= c.battle["phases"]["names"][phase].replace(" ", "")
-		for orcondition in conditions.split("|"):
-			orconditions= orcondition.split("&")
-			# truthy result found using divisor
-			divisor= len(orconditions)
-			for condition in orconditions:
-				# start of battle condition
-				if condition.lower() == "start":
+async def cond_check(s: BattleSession, turn: int, queue: TurnQueue):
+	enemies= queue.enemies()
+	state= triggers.State(turn, not enemies, queue.members.values())
+	# only phases watching what changed since the last check
+	for phase in s.phases.due():
+		if not phase.met(state):
+			continue
+		for result in phase.results:
+			kind= result[0]
+			# win event
+			if kind == "win":
+				s.win= True
+			# lose event
+			elif kind == "lose":
+				s.lose= True
+			# execute move
+			elif kind == "move":
+				if isinstance(result[1], int):
+					# enemy move, aimed at the player
+					info= s.battle["enemies"][result[1]]["moves"][result[2]]
+					name= s.battle["enemies"][result[1]]["moves"].names[result[2]]
+					target= [queue.player]
+				else:
+					info= result[1]
+					name= None
+					# set move target
 					if not enemies:
-						met+= 1/divisor
-				# turn condition
-				elif re.findall(r"^[tT](?>[+]\d+|\d+)", condition):
-					comp= int(re.findall(r'\d+', condition)[0])
-					if comp == turn:
-						met+= 1/divisor
-					elif re.findall(r'+', condition)[0]:
-						if turn % comp == 0:
-							met+= 1/divisor
-				# enemy @ stat condition
-				elif re.findall(r"(?i:^e\d(?>[<>]=|[=<>])(?>\d{1,2})(?>hp|fp|pow|def|speed|stache))", condition):
-					# numbers [enemy id and stat no.]
-					nums= re.findall(r'\d+', condition)
-					for guy in lineup:
-						if hasattr(guy, "id"):
-							if guy.id == int(nums[0])-1:
-								# the selected stat
-								stat= int(getattr(guy, re.findall(r'\D+$', condition)[0].upper()))
-								break
-							else:
-								stat= None
-					if stat:
-						operand= re.findall(r'[<>]=|[=<>]', condition)[0]
-						# set check
-						if operand == "=":
-							check = bool(stat == int(nums[1]))
-						elif operand == ">":
-							check = bool(stat > int(nums[1]))
-						elif operand == "<":
-							check = bool(stat < int(nums[1]))
-						elif operand == ">=":
-							check = bool(stat >= int(nums[1]))
-						elif operand == "<=":
-							check = bool(stat <= int(nums[1]))
-						# check if true
-						if check:
-							met+= 1/divisor
-			met= bool(math.floor(met))
-			if met:
-				break
-		if met:
-			results= c.battle["phases"][phase].split("&")
-			for result in results:
-				# every result except sys uses wResult
-				wResult= result.replace(" ", "")
-				# win event
-				if wResult == "win":
-					c.win= True
-				# lose event
-				elif wResult == "lose":
-					c.lose= True
-				# execute move
-				elif re.findall(r'(?i:^move:)(?>(?>(?>\d{1,2})(?>,\d){5,6})|(?>\d,\d))(?!.+)', wResult):
-					data= re.findall(r'(?i:(?<=^move:)).*', wResult)[0].split(',')
-					if len(data) == 2:
-						# format: [enemy index],[move index]
-						info= c.battle["enemies"][int(data[0])]["moves"][int(data[1])]
-						name= c.battle["enemies"][int(data[0])]["moves"]["names"][int(data[1])]
-						# set move target
-						target= player
+						continue
+					if info['target'] == "All":
+						target= enemies
+					elif info['target'] == "One":
+						index= result[2] if result[2] is not None and result[2] < len(enemies) else 0
+						target= [enemies[index]]
 					else:
-						# format: [amount(2 digits)],[hits(1 digit)],[type(0/1/2)],[offense(0/1)],[stat(0/1/2/3/4/5)],[target(0/1/2)],(optional)[enemy index]
-						info= {}
-						name= None
-						info['amount']= data[0]
-						info['hits']= data[1]
-						info['type']= num_to_list(data[2], ["Ground", "Aerial", "Magic"])
-						info['offense']= bool(data[3])
-						info['stat']= num_to_list(data[4], ["HP", "FP", "POW", "DEF", "SPEED", "STACHE"])
-						info['target']= num_to_list(data[5], ["One", "All", "Random"])
-						# set move target
-						if info['target'] == "All":
-							target= []
-							for i in enemies:
-								target.append(lineup[i])
-						elif info['target'] == "One":
-							index= data[6]
-							target= [lineup[enemies[index]]]
-						else:
-							target= [lineup[random.choice(enemies)]]
-					move= Action(name= name, obj= info)
-					await move.deploy_action(target)
-				# dialogue events
-				elif re.findall(r'(?i:^event)\d', wResult):
-					webhook= None
-					dialogue= c.battle["dialogue"]
-					event= dialogue["events"][int(re.findall(r'\d', wResult)[0])-1]
-					for line in event:
-						if not webhook:
-							# check if webhook can be fetched, if not- create webhook
-							try:
-								webhook= await ctx.app.rest.fetch_webhook(c.save.get("webhook"))
-							except:
-								webhook= await ctx.app.rest.create_webhook(channel= c.save["channel"], name= "Starlow")
-								# save webhook id to database
-								c.save["webhook"]= webhook.webhook_id
-								sql_tools.saveID(ctx.guild_id, c.save)
-						await webhook.edit(name= dialogue["chars"]["names"][int(line[0])-1], avatar= dialogue["chars"][int(line[0])-1])
-						await ctx.app.rest.execute_webhook(webhook, webhook.token, line[1])
-					await webhook.edit(name= "Starlow")
-					time.sleep(0.3)
-				# system messages
-				elif re.findall(r'(?i:^sys:).+', result):
-					sys= re.findall(r'(?i:(?<=^sys:)).+', result)[0]
-					await c.channel.send(sys)
-				# spawn enemies
-				elif re.findall(r'(?i:^spawn:)\d,\d', wResult):
-					spawns= re.findall(r'(?i:(?<=^spawn:))\d,\d', result)[0].split("&")
-					for spawn in spawns:
-						i= spawn.split(",")
-						for j in range(int(i[1])):
-							enemy= Enemy(int(i[0])-1)
-							lineup.append(enemy)
+						target= [random.choice(enemies)]
+				move= Action(name= name, obj= info)
+				await move.deploy_action(s, target)
+				s.phases.mark(*(guy.id for guy in target if guy.kind is Kind.ENEMY))
+			# dialogue events
+			elif kind == "event":
+				await s.port.dialogue(s.events[result[1]])
+				await s.port.pause(0.3)
+			# system messages
+			elif kind == "sys":
+				await s.port.show(result[1])
+			# spawn enemies
+			elif kind == "spawn":
+				for j in range(result[2]):
+					queue.add(Enemy(s, result[1]))
+				s.phases.mark(result[1])
 
 # manages turn events and order
-async def turn_order(ctx: lightbulb.Context):
+async def turn_order(s: BattleSession):
 	turn= 1
-	# moves grouped by rarity
-	rMoves= group_rare()
+	# jump/hammer
+	basic= catalog.get("basic")
 	# player data
-	pData= Player(name= c.save["player"]["name"], obj= c.save["player"])
-	await pData.sticker_roulette(ctx, rMoves)
-	# player/enemy lineup
-	lineup= [pData, ]
-	await c.channel.send(c.StEmbed(title= "B A T T L E  S T A R T !"))
-	# player/enemy indexes
-	player= 0
-	enemies= []
+	pData= Player(name= s.save["player"]["name"], obj= s.save["player"], mode= s.save["mode"])
+	await pData.sticker_roulette(s)
+	# turn order of everyone alive
+	queue= s.queue= TurnQueue()
+	queue.add(pData)
+	await s.port.show(Card(title= "B A T T L E  S T A R T !"))
+	# compile phases and dialogue once, broken ones are reported and skipped
+	phases, errors= triggers.compile_phases(s.battle)
+	s.phases= triggers.PhaseIndex(phases)
+	s.events, eventErrors= triggers.compile_events(s.battle)
+	errors= triggers.repairs(s.battle)+errors+eventErrors
+	if errors:
+		await s.port.show(Card(title= "Some of this battle was skipped:", description= "\n".join(str(e) for e in errors)))
 	# initial condition check
-	await cond_check(ctx, turn, lineup, enemies, player)
-	# battle loop
-	while not c.win and not c.lose:
-		# speed check, reset player/enemy indexes
-		enemies= []
-		max= 0
-		for i, guy in enumerate(lineup):
-			if int(guy.SPEED) > max:
-				lineup.remove(guy)
-				lineup.insert(0, guy)
-				max= int(guy.SPEED)
-			if guy.__class__.__name__ == "Enemy":
-				enemies.append(i)
-			elif guy.__class__.__name__ == "Player":
-				player= i
+	await cond_check(s, turn, queue)
+	# battle loop, one round at a time
+	while not s.win and not s.lose:
+		queue.start_round()
 		# block check
 		didnt_block= True
-		# player/enemy turns
-		for guy in lineup:
-			one_more= True
-			while one_more:
-				one_more= False
-				if guy.__class__.__name__ == "Player":
-					# setting up embed and reactions
-					emojis= ['<:st_jump:1136186635839623268>', '<:st_hammer:1136186760041336893>']
-					# enemy info
-					etext= ""
-					for i in enemies:
-						enemy= lineup[i]
-						etext+= f"**{enemy.name}**"
-						if not c.save["hideHP"]:
-							etext+=f" | {enemy.HP}/{enemy.maxHP} HP"
-						if i != len(enemies):
-							etext+= "\n"
-					desc= f"♥{guy.HP}/{guy.maxHP} HP\n{etext}\n\nWhat will you do?\n{emojis[0]} **Jump**\n{emojis[1]} **Hammer**"
-					if guy.moves:
-						emojis.append("📖")
-						desc+= "\n📖 **Stickers**"
-					if not guy.FP == 0 and c.save['coins'] >= 15:
-						emojis.append("🎰")
-						desc+= "\n🎰 **Battle Spinner** (15 coins)"
-					# show inventory
-					icons= ""
+		# player/enemy turns, fastest first
+		while not s.win and not s.lose:
+			guy= queue.next()
+			if guy is None:
+				break
+			enemies= queue.enemies()
+			player= queue.player
+			if guy.kind is Kind.PLAYER:
+				# setting up embed and reactions
+				emojis= ['<:st_jump:1136186635839623268>', '<:st_hammer:1136186760041336893>']
+				# enemy info
+				etext= ""
+				for i, enemy in enumerate(enemies):
+					etext+= f"**{enemy.name}**"
+					if not s.save["hideHP"]:
+						etext+=f" | {enemy.HP}/{enemy.maxHP} HP"
+					if i != len(enemies)-1:
+						etext+= "\n"
+				desc= f"♥{guy.HP}/{guy.maxHP} HP\n{etext}\n\nWhat will you do?\n{emojis[0]} **Jump**\n{emojis[1]} **Hammer**"
+				if guy.moves:
+					emojis.append("📖")
+					desc+= "\n📖 **Stickers**"
+				if not guy.FP == 0 and s.save['coins'] >= 15:
+					emojis.append("🎰")
+					desc+= "\n🎰 **Battle Spinner** (15 coins)"
+				# show inventory
+				icons= ""
+				for id, num in guy.moves.items():
+					for j in range(num):
+						icons+= s.moves[id]["icon"]
+				if guy.moves:
+					desc+= f"\n\n> Inventory({guy.maxFP-guy.FP}/{guy.maxFP}): {icons}"
+				embed= Card(title= f"{guy.name}'s Turn!", description= desc, footer= f"{s.save['coins']} coins")
+				one= await s.port.hud(embed, emojis)
+				# jump or hammer
+				if one.id == 0 or one.id == 1:
+					move= basic.actions[one.id]
+				# sticker album
+				elif one.emoji == '📖':
+					# set sticker prompt
+					desc= f"{guy.maxFP-guy.FP}/{guy.maxFP} stickers.\n"
+					emojis= []
 					for id, num in guy.moves.items():
-						for j in range(num):
-							icons+= c.moves[id]["icon"]
-					if guy.moves:
-						desc+= f"\n\n> Inventory({guy.maxFP-guy.FP}/{guy.maxFP}): {icons}"
-					embed= (
-						c.StEmbed(title= f"{guy.name}'s Turn!", description= desc)
-						.set_footer(f"{c.save['coins']} coins")
-					)
-					msg= await c.channel.send(embed)
-					one= await react_count(ctx.app.rest, msg, emojis)
-					# jump or hammer
-					if one.id == 0 or one.id == 1:
-						# if jump, else hammer
-						if one.id == 0:
-							name= 'Jump'
-						else:
-							name= 'Hammer'
-						# get basic move path
-						path= os.path.abspath(__file__).replace(r"\btl_logic.py", r"\templates\basic.json")
-						with open(path) as f:
-							move= Action(jsonStr(f.read())[one.id], name)
-					# sticker album
-					elif one.emoji == '📖':
-						# set sticker prompt
-						desc= f"{guy.maxFP-guy.FP}/{guy.maxFP} stickers.\n"
-						emojis= []
-						for id, num in guy.moves.items():
-							desc+= f"\n**{c.moves[id]['icon']} {c.moves['names'][id]} x{num}** | {c.moves[id]['info']}"
-							emojis.append(c.moves[id]['icon'])
-						embed= c.StEmbed(title= "Sticker Album", description= desc)
-						msg= await c.channel.send(embed)
-						choice= await react_count(ctx.app.rest, msg, emojis)
-						# fetch move
-						key= list(guy.moves)[choice.id]
-						move= Action(c.moves[key], c.moves["names"][key])
-						# remove sticker
-						guy.moves[key]-=1
-						guy.FP+=1
-						if guy.moves[key] == 0:
-							guy.moves.pop(key)
-					# battle spinner
-					elif one.emoji == '🎰':
-						# add 3 random stickers
-						for i in range(3):
-							fun= await random_sticker(guy, rMoves)
-							if not fun:
-								break
-						# remove 15 coins
-						c.save['coins']-= 15
-						sql_tools.saveID(ctx.guild_id, c.save)
-						one_more= True
-						continue
-					# target selection
-					if move.offense:
-						if len(enemies) > 1:
-							if move.target == "One":
-								em_num= ['1️⃣', '2️⃣', '3️⃣', '4️⃣', '5️⃣', '6️⃣', '7️⃣', '8️⃣', '9️⃣']
-								emojis= []
-								desc= ""
-								for i, enemyI in enumerate(etext.split("\n")):
-									emojis.append(em_num[i])
-									desc+= f"{em_num[i]} {enemyI}\n"
-								embed= c.StEmbed(title= "Select a target!", description= desc)
-								msg= await c.channel.send(embed)
-								two= await react_count(ctx.app.rest, msg, emojis)
-								target= [lineup[enemies[two.id]]]
-							elif move.target == "All":
-								target= []
-								for i in enemies:
-									target.append(lineup[i])
-							elif move.target == "Random":
-								i= random.choice(enemies)
-								target= [lineup[i]]
-						else:
-							target= [lineup[enemies[0]]]
+						desc+= f"\n**{s.moves[id]['icon']} {s.moves.name(id)} x{num}** | {s.moves[id]['info']}"
+						emojis.append(s.moves[id]['icon'])
+					embed= Card(title= "Sticker Album", description= desc)
+					choice= await s.port.choose(embed, emojis)
+					# fetch move
+					key= list(guy.moves)[choice.id]
+					move= s.moves.action(key)
+					# remove sticker
+					guy.moves[key]-=1
+					guy.FP+=1
+					if guy.moves[key] == 0:
+						guy.moves.pop(key)
+				# battle spinner
+				elif one.emoji == '🎰':
+					# add 3 random stickers
+					for i in range(3):
+						fun= await random_sticker(s, guy)
+						if not fun:
+							break
+					# remove 15 coins
+					s.save['coins']-= 15
+					await s.port.save()
+					# choose again
+					queue.again(guy)
+					continue
+				# target selection
+				if move.offense:
+					if len(enemies) > 1:
+						if move.target == "One":
+							em_num= ['1️⃣', '2️⃣', '3️⃣', '4️⃣', '5️⃣', '6️⃣', '7️⃣', '8️⃣', '9️⃣']
+							emojis= []
+							desc= ""
+							for i, enemyI in enumerate(etext.split("\n")[:len(em_num)]):
+								emojis.append(em_num[i])
+								desc+= f"{em_num[i]} {enemyI}\n"
+							embed= Card(title= "Select a target!", description= desc)
+							two= await s.port.choose(embed, emojis)
+							target= [enemies[two.id]]
+						elif move.target == "All":
+							target= enemies
+						elif move.target == "Random":
+							target= [random.choice(enemies)]
 					else:
-						target= [guy]
-					blocked= False
-				elif guy.__class__.__name__ == "Enemy":
-					if didnt_block:
-						# block prompt
-						embed= c.StEmbed(title= "Block the attack!", description= "React to this message to block enemies' attacks!")
-						msg= await c.channel.send(embed)
-						react= await react_count(ctx.app.rest, msg, ['🛡'])
-						# check if valid
-						if react.count > c.members*0.75:
-							blocked= True
-							if random.random() <= (25+50*(lineup[player].STACHE/100))/100:
-								await random_sticker(lineup[player], rMoves)
-						else:
-							blocked= False
-						didnt_block= False
-					# select move
-					if guy.moves:
-						move= random.choice(guy.moves)
-					# select target
-					if move.offense:
-						target= [lineup[player]]
+						target= [enemies[0]]
+				else:
+					target= [guy]
+				blocked= False
+			elif guy.kind is Kind.ENEMY:
+				if didnt_block:
+					# block prompt
+					embed= Card(title= "Block the attack!", description= "React to this message to block enemies' attacks!")
+					react= await s.port.choose(embed, ['🛡'])
+					# check if valid
+					if react.count >= s.members*0.75:
+						blocked= True
+						if random.random() <= (25+50*(player.STACHE/100))/100:
+							await random_sticker(s, player)
+					else:
+						blocked= False
+					didnt_block= False
+				# select move
+				if guy.moves:
+					move= random.choice(guy.moves)
+				# select target
+				if move.offense:
+					target= [player]
+				else:
+					if move.target == "One" or move.target == "Random":
+						target= [random.choice(enemies)]
 					else:
-						if move.target == "One" or move.target == "Random":
-							i= random.choice(enemies)
-							target= [lineup[i]]
-						else:
-							target= []
-							for i in enemies:
-								target.append(lineup[i])
-				# initate action
-				await move.deploy_action(target, guy, blocked)
-				if random.random() == int(guy.SPEED)/100:
-					one_more= True
-					await c.channel.send(c.StEmbed(description= "One more!"))
+						target= enemies
+			# initate action
+			await move.deploy_action(s, target, guy, blocked)
+			s.phases.mark(*(person.id for person in target if person.kind is Kind.ENEMY))
+			if random.random() == guy.SPEED/100:
+				queue.again(guy)
+				await s.port.show(Card(description= "One more!"))
 			# rotating condition check
-			await cond_check(ctx, turn, lineup, enemies, player)
+			await cond_check(s, turn, queue)
 			# check if 0 HP
 			for person in target:
-				if person.HP <= 0:
-					if person.__class__.__name__ == "Player":
-						c.lose= True
+				if person.HP <= 0 and person in queue:
+					if person.kind is Kind.PLAYER:
+						s.lose= True
 						break
 					else:
-						lineup.remove(person)
-						if len(lineup) == 1:
-							c.win= True
+						queue.remove(person)
+						s.phases.mark(person.id)
+						if not queue.enemyCount:
+							s.win= True
 							break
 						# enemy defeat bonus
-						if random.random() == int(guy.STACHE)/100:
+						if random.random() == guy.STACHE/100:
 							choice= random.randrange(0, 3)
 							if choice == 0:
 								guy.HP= guy.maxHP
@@ -602,20 +564,23 @@ async def turn_order(ctx: lightbulb.Context):
 								guy.DEF+= 2
 								txt= "DEF Up"
 							elif choice == 3:
-								one_more= True
+								queue.again(guy)
 								txt= "One more"
-							await c.channel.send(c.StEmbed(description= f"{txt}!"))
+							await s.port.show(Card(description= f"{txt}!"))
+							if guy.kind is Kind.ENEMY:
+								s.phases.mark(guy.id)
 			# advance turn
-			turn+=1/len(lineup)
-	if c.win:
-		await c.channel.send("You win!")
-		time.sleep(0.3)
+			turn+=1/len(queue)
+			s.phases.mark("turn")
+	if s.win:
+		await s.port.show("You win!")
+		await s.port.pause(0.3)
 		# battle rewards
-		if c.save['reward']['set'] == "Choice":
+		if s.save['reward']['set'] == "Choice":
 			# reward select prompt
 			desc= ''
 			emojis= []
-			items= c.save['reward']['items']
+			items= s.save['reward']['items']
 			if 'HP' in items:
 				emojis.append('♥')
 				desc+= "♥ HP-Up Heart\n"
@@ -628,9 +593,8 @@ async def turn_order(ctx: lightbulb.Context):
 			if 'STACHE' in items:
 				emojis.append('💇‍♂️')
 				desc+= f"💇‍♂️ Stache-Up Comb"
-			embed= c.StEmbed(title="Select Reward!", description= desc)
-			msg= await c.channel.send(embed)
-			choice= await react_count(ctx.app.rest, msg, emojis)
+			embed= Card(title="Select Reward!", description= desc)
+			choice= await s.port.choose(embed, emojis)
 			# get stat
 			if choice.id == 0:
 				stat= ['HP']
@@ -640,32 +604,25 @@ async def turn_order(ctx: lightbulb.Context):
 				stat= ['SPEED']
 			elif choice.id == 3:
 				stat= ['STACHE']
-		elif c.save['reward']['set'] == "All":
-			stat= c.save['reward']['items']
+		elif s.save['reward']['set'] == "All":
+			stat= s.save['reward']['items']
 		else:
-			stat= [random.choice(c.save['reward']['items'])]
+			stat= [random.choice(s.save['reward']['items'])]
 		# set stat reward
 		stat_txt= ''
 		for item in stat:
-			c.save['player'][item]+=5
+			s.save['player'][item]+=5
 			stat_txt+= f'+5 {item}.\n'
 		# set coin reward
 		coins= 0
-		for i in range(len(c.battle['enemies'])-1):
-			enemy= c.battle['enemies'][i]
+		for enemy in s.battle['enemies']:
 			coins+= (int(enemy['HP'])+int(enemy['POW'])+int(enemy['DEF']))
-		c.save['coins']+= coins
+		s.save['coins']+= coins
 		# save to database
-		sql_tools.saveID(ctx.guild_id, c.save)
+		await s.port.save()
 		# send final message
-		embed= (
-			c.StEmbed(title= "Rewards:", description= f"{stat_txt}+{coins} coins.")
-			.set_footer("See you next time!")
-		)
-		await c.channel.send(embed)
-	elif c.lose:
-		await c.channel.send("You lose.")
-	# reset global values
-	c.moves = {}
-	c.win= False
-	c.lose= False
\ No newline at end of file
+		embed= Card(title= "Rewards:", description= f"{stat_txt}+{coins} coins.", footer= "See you next time!")
+		await s.port.show(embed)
+	elif s.lose:
+		await s.port.show("You lose.")
+	await s.port.finish()
\ No newline at end of file
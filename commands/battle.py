@@ -1,10 +1,12 @@
 import lightbulb
 import re
-import os
-import time
+import votes
+import hikari
 import sql_tools
 import config as c
-from slipper import jsonStr
+from session import EditorSession, SessionError, sessions
+from slipper import NamedList, jsonStr
+from discord_port import DiscordPort
 from hikari import OptionType, MessageFlag, Permissions
 from miru import SelectOption
 import btl_logic as btl
@@ -12,6 +14,8 @@ import interface.views as views
 import interface.btl_comp as btlc
 
 plugin = lightbulb.Plugin("battle")
+# battle slot choices
+SLOTS= [f"Slot {i+1}" for i in range(c.battle_slots)]
 
 @plugin.command
 @lightbulb.command("battle", "Create, edit, and export battles.")
@@ -29,17 +33,16 @@ async def btl_editor(ctx: lightbulb.Context):
 	if hasattr(ctx.options, "battle"):
 		# get battle slot
 		i= int(re.findall(r'\d+', ctx.options.battle)[0])-1
-		btl_save= sql_tools.loadID(ctx.guild_id, False)[i]
+		btl_save= await sql_tools.aLoadBattle(ctx.guild_id, i)
 		if not btl_save:
 			await ctx.respond(content= "That slot is empty. Use `/battle create` to add a new battle instead.", flags= MessageFlag.EPHEMERAL)
 			return
-		c.save= btl_save
 		sys.insert(0, views.SaveButton())
 	else:
 		i= None
-		c.save= {"phases":{"names":[]}, "enemies":{"names":[]}, "dialogue":{"chars":{"names":[]}, "events":[]}}
+		btl_save= {"phases": NamedList(), "enemies": NamedList(), "dialogue": {"chars": NamedList(), "events": []}}
 		sys.insert(0, btlc.StAdd())
-	c.enemy= True
+	session= EditorSession(str(ctx.guild_id), btl_save, enemy= True)
 	# battle editor options
 	options=[
 		SelectOption(label="Order of Events", description="Set the order of battle events, and their conditions.", emoji= chr(0x26F3), is_default= True),
@@ -48,16 +51,16 @@ async def btl_editor(ctx: lightbulb.Context):
 		]
 	# Editor panels
 	panels= [
-		btlc.PhasePanel(),
-		btlc.EnemyPanel(),
-		btlc.CharPanel()
+		btlc.PhasePanel(session),
+		btlc.EnemyPanel(session),
+		btlc.CharPanel(session)
 		]
 	# current command user
 	user= ctx.author
-	view= views.MainView(user, panels, options, sys)
+	view= views.MainView(user, panels, options, sys, session)
 	# battle slot no. (only on edit)
 	view.choice= i
-	if isinstance(view.pages, list):
+	if views.paged(view.pages):
 		embed1= view.pages[0]
 	else:
 		embed1= view.pages
@@ -75,7 +78,7 @@ async def create(ctx: lightbulb.Context):
 
 @battle.child
 @lightbulb.add_checks(lightbulb.has_guild_permissions(Permissions.MANAGE_CHANNELS))
-@lightbulb.option("battle", "The battle you want to edit.", required= True, choices= ["Slot 1", "Slot 2", "Slot 3", "Slot 4", "Slot 5"])
+@lightbulb.option("battle", "The battle you want to edit.", required= True, choices= SLOTS)
 @lightbulb.command("edit", "Edit an existing battle.")
 @lightbulb.implements(lightbulb.SlashSubCommand)
 async def edit(ctx: lightbulb.Context):
@@ -83,55 +86,66 @@ async def edit(ctx: lightbulb.Context):
 
 @battle.child
 @lightbulb.add_checks(lightbulb.has_guild_permissions(Permissions.MANAGE_CHANNELS))
-@lightbulb.option("battle", "A battle saved in Starlow.", choices= ["Slot 1", "Slot 2", "Slot 3", "Slot 4", "Slot 5"], required= False)
+@lightbulb.option("battle", "A battle saved in Starlow.", choices= SLOTS, required= False)
 @lightbulb.option("file", "A Starlow-supported .json file.", type= OptionType.ATTACHMENT, required= False)
 @lightbulb.command("start", "Start a battle.")
 @lightbulb.implements(lightbulb.SlashSubCommand)
 async def start(ctx: lightbulb.Context):
 	if ctx.options.battle or ctx.options.file:
-		c.save= []
 		# check for input
 		if ctx.options.battle:
 			# get slot index
 			i= int(re.findall(r'\d+', ctx.options.battle)[0])-1
 			# get battle from slot
-			c.battle= sql_tools.loadID(ctx.guild_id, False)[i]
+			battle= await sql_tools.aLoadBattle(ctx.guild_id, i)
 		elif ctx.options.file:
 			# read file
 			async with ctx.options.file.stream() as f:
 				data= await f.read()
-			c.battle = jsonStr(data.decode("utf-8"))
+			battle = jsonStr(data.decode("utf-8"))
 		# get settings
-		c.save= sql_tools.loadID(ctx.guild_id)
-		# get special moves data
-		path= os.path.abspath(__file__).replace(r"\commands\battle.py", r"\templates\special.json")
-		with open(path) as f:
-			c.moves= jsonStr(f.read())
-		# add custom moves to c.moves
-		if c.save["moves"].get("names"):
-			for j, name in enumerate(c.save["moves"]["names"]):
-				c.moves["names"].append(name)
-				num= j+len(c.save["moves"]["names"])-1
-				c.moves[num]= c.save["moves"][j]
+		save= await sql_tools.aLoadID(ctx.guild_id)
 		# get battle channel
-		c.channel= await ctx.app.rest.fetch_channel(c.save["channel"])
-		await ctx.respond(content= f"The battle is now starting in {c.channel.mention}!", flags= MessageFlag.EPHEMERAL)
-		# set member acquisition message
-		embed= (
-			c.StEmbed(title="React to join!", description="If you want to join the battle, react to this message now!")
-			.set_footer("The battle will start in 1 minute!")
-		)
-		msg= await c.channel.send(embed= embed)
-		await ctx.app.rest.add_reaction(message= msg, channel= c.channel, emoji= "🟡")
-		# wait a minute for registration
-		time.sleep(60)
-		# update message info
-		msg= await c.channel.fetch_message(msg)
-		c.members= msg.reactions[0].count-1
-		await btl.turn_order(ctx)
+		channel= await ctx.app.rest.fetch_channel(save["channel"])
+		# one battle per channel, up to config.max_battles in total
+		try:
+			s= sessions.open(str(ctx.guild_id), channel)
+		except SessionError as e:
+			await ctx.respond(content= str(e), flags= MessageFlag.EPHEMERAL)
+			return
+		try:
+			s.battle= battle
+			s.save= save
+			# special moves with the guild's custom moves on top
+			s.moves= btl.GuildMoves(btl.catalog.get("special"), s.save["moves"])
+			await ctx.respond(content= f"The battle is now starting in {s.channel.mention}!", flags= MessageFlag.EPHEMERAL)
+			# set member acquisition message
+			embed= (
+				c.StEmbed(title="React to join!", description="If you want to join the battle, react to this message now!")
+				.set_footer("The battle will start in 1 minute!")
+			)
+			msg= await s.channel.send(embed= embed)
+			votes.collector.open(msg.id, ["🟡"])
+			await ctx.app.rest.add_reaction(message= msg, channel= s.channel, emoji= "🟡")
+			# wait a minute for registration
+			join= await votes.collector.wait(msg.id, 60)
+			s.members= join.count
+			s.port= DiscordPort(ctx.app, s)
+			await btl.turn_order(s)
+		finally:
+			sessions.close(s)
 	else:
 		await ctx.respond(content= "Please select a battle from either your files or Starlow's database.", flags= MessageFlag.EPHEMERAL)
 
+# reaction votes (see votes.py)
+@plugin.listener(hikari.GuildReactionAddEvent)
+async def on_reaction_add(event: hikari.GuildReactionAddEvent):
+	votes.collector.on_add(event)
+
+@plugin.listener(hikari.GuildReactionDeleteEvent)
+async def on_reaction_remove(event: hikari.GuildReactionDeleteEvent):
+	votes.collector.on_remove(event)
+
 def load(bot):
 	bot.add_plugin(plugin)
 
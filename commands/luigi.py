@@ -8,7 +8,7 @@ plugin = lightbulb.Plugin("luigi")
 @lightbulb.command("luigi", "Starlow’s opinion on Luigi. (May include vulgar language)")
 @lightbulb.implements(lightbulb.SlashCommand)
 async def luigi(ctx: lightbulb.Context) -> None:
-	if sql_tools.isLuigi(str(ctx.guild_id)):
+	if await sql_tools.aIsLuigi(str(ctx.guild_id)):
 		responses = [
 		"i fucking despise luigi",
 		"Mario >>>>>>>>>>>>>>>>>>> Luigi",
@@ -1,6 +1,7 @@
 import lightbulb
 import sql_tools
-import config as c
+from session import EditorSession
+from slipper import NamedList
 from miru import SelectOption
 from hikari import Permissions
 import interface.views as views
@@ -15,14 +16,11 @@ plugin = lightbulb.Plugin("settings")
 @lightbulb.command("settings", "Modify default player and battle settings.")
 @lightbulb.implements(lightbulb.SlashCommand)
 async def settings(ctx: lightbulb.Context) -> None:
-    c.enemy= False
     # check db file for guild key
-    loadedSave= sql_tools.loadID(ctx.guild_id)
-    if loadedSave:
-        c.save= loadedSave
-    else:
+    loadedSave= await sql_tools.aLoadID(ctx.guild_id)
+    if not loadedSave:
         # default settings
-        c.save= {"mode": "sticker", "coins": 100, "hideHP": False, "luigi": True, "reward": {"items": ["HP"], "set": "All"}, "channel": "","player": {"name": "Mario", "HP": 10, "FP": 5, "POW": 1, "DEF": 0, "SPEED": 0, "STACHE": 0}, "moves": {"names": []}}
+        loadedSave= {"mode": "sticker", "coins": 100, "hideHP": False, "luigi": True, "reward": {"items": ["HP"], "set": "All"}, "channel": "","player": {"name": "Mario", "HP": 10, "FP": 5, "POW": 1, "DEF": 0, "SPEED": 0, "STACHE": 0}, "moves": NamedList()}
     
     # Settings Options
     options=[
@@ -33,6 +31,8 @@ async def settings(ctx: lightbulb.Context) -> None:
     SelectOption(label="Miscellaneous Settings", description="Set battle channel, hide enemy HP, and disable /luigi.", emoji= chr(0x2699))
     ]
     
+    session= EditorSession(str(ctx.guild_id), loadedSave)
+    
     # system buttons (shown in bottom row)
     sys= [
     views.SaveButton(),
@@ -41,17 +41,17 @@ async def settings(ctx: lightbulb.Context) -> None:
     ]
     
     # panel and user setup
-    panel1= set.ModePanel()
+    panel1= set.ModePanel(session)
     embed1= panel1.embeds
     panels= [
         panel1,
-        set.PlayerPanel(),
-        comp.MovePanel(),
-        set.RewardPanel(),
-        set.MiscPanel()
+        set.PlayerPanel(session),
+        comp.MovePanel(session),
+        set.RewardPanel(session),
+        set.MiscPanel(session)
         ]
     user= ctx.author
-    view= views.MainView(user, panels, options, sys)
+    view= views.MainView(user, panels, options, sys, session)
     message= await ctx.respond(embed=embed1, components=view)
     # Starts UI View with the embed
     await view.start(message)
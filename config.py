@@ -1,8 +1,4 @@
-from hikari import Embed, TextableChannel, ChannelType
-# public dictionaries
-save = {}
-moves = {}
-battle = {}
+from hikari import Embed
 # Starlow embed
 class StEmbed(Embed):
 	def __init__(self, *args, **kwargs):
@@ -12,12 +8,24 @@ class StEmbed(Embed):
 		**kwargs
 		)
 
-# bools
-# tracking win/lose conditions
-win= False
-lose= False
-# enemy check
-enemy= False
-# other
-channel= TextableChannel(app= None, id= 0, name= None, type= ChannelType.GUILD_TEXT)
-members= None
\ No newline at end of file
+# battle/editor state lives in session.py, one session per battle or editor
+# battles that can run at once across all guilds
+max_battles= 200
+# database durability
+# "full": every save is written and synced to disk straight away
+# "normal": every save is written straight away, synced at WAL checkpoints
+# "buffered": battle saves are coalesced per guild and written every db_flush seconds (and at battle end/shutdown)
+db_durability= "buffered"
+db_flush= 10
+# compression of stored settings and battles: "zlib", "lzma" or None (plain json). old rows are read either way
+db_compress= "zlib"
+# seconds before a multi-hit move's message is edited to show every hit. 0 shows them all at once
+hit_pace= 0.3
+# dialogue lines sent at once. above 1 lines go out faster but may arrive out of order
+dialogue_pipeline= 1
+# player turns edit one status message per battle, voted on with its buttons, instead of sending a new prompt each turn
+battle_hud= True
+# battle slots per server (Discord allows up to 25 choices)
+battle_slots= 5
+# guilds whose decoded settings are kept in memory
+db_cache= 256
@@ -0,0 +1,186 @@
+import asyncio
+import hikari
+import lightbulb
+import miru
+import sql_tools
+import timers
+import votes
+import config as c
+from ports import Card, Choice, Port
+from session import BattleSession
+# the bot's battle port: cards become embeds in the battle channel, choices are reaction votes (button votes on the status message)
+
+def render(out: Card | str):
+	if isinstance(out, str):
+		return out
+	embed= c.StEmbed(title= out.title, description= out.description)
+	if out.footer:
+		embed.set_footer(out.footer)
+	return embed
+
+# Starlow's webhook in each battle channel, kept across battles. speakers are set per message, so the webhook is never edited
+class WebhookCache:
+	def __init__(self):
+		# channel id -> webhook
+		self.hooks= {}
+
+	async def get(self, port) -> hikari.IncomingWebhook:
+		channel= port.s.channel.id
+		webhook= self.hooks.get(channel)
+		if webhook is None:
+			# the guild's saved webhook, if it still exists in this channel
+			if port.s.save.get("webhook"):
+				try:
+					webhook= await port.app.rest.fetch_webhook(port.s.save["webhook"])
+				except (hikari.NotFoundError, hikari.ForbiddenError):
+					webhook= None
+				if webhook is not None and (webhook.channel_id != channel or not webhook.token):
+					webhook= None
+			if webhook is None:
+				webhook= await port.app.rest.create_webhook(channel= channel, name= "Starlow")
+				# save webhook id to database
+				port.s.save["webhook"]= webhook.id
+				await port.save()
+			self.hooks[channel]= webhook
+		return webhook
+
+	# forget a webhook that was deleted
+	def drop(self, port):
+		self.hooks.pop(port.s.channel.id, None)
+
+webhooks= WebhookCache()
+
+# the status message's buttons, one per option this turn. it lives as long as the message,
+# presses while no vote is open are acknowledged and ignored
+class HudView(miru.View):
+	def __init__(self):
+		super().__init__(timeout= None)
+		# the vote running on the message, None between turns
+		self.vote= None
+
+	# this turn's buttons (sent with the turn's edit) and the vote they feed
+	def options(self, emojis: list[str], vote: votes.Vote):
+		self.vote= vote
+		self.clear_items()
+		for i, emoji in enumerate(emojis):
+			self.add_item(OptionButton(i, emoji))
+
+class OptionButton(miru.Button):
+	def __init__(self, index: int, emoji: str):
+		super().__init__(emoji= emoji, style= hikari.ButtonStyle.SECONDARY, custom_id= f"hud{index}")
+		self.index= index
+
+	async def callback(self, ctx: miru.ViewContext):
+		await ctx.defer()
+		# a player's latest press is their vote
+		if self.view.vote is not None:
+			self.view.vote.pick(ctx.user.id, self.index)
+
+class DiscordPort(Port):
+	def __init__(self, app: lightbulb.BotApp, s: BattleSession):
+		self.app= app
+		self.s= s
+		# pending animation edits
+		self.tasks= set()
+		# the status message player turns are shown on, and its buttons (see hud)
+		self.status= None
+		self.view= None
+
+	async def show(self, out: Card | str) -> hikari.Message:
+		return await self.s.channel.send(render(out))
+
+	async def update(self, handle: hikari.Message, out: Card | str) -> hikari.Message:
+		return await handle.edit(render(out))
+
+	# multi-hit moves show the first hit, then every hit in one edit scheduled c.hit_pace seconds later
+	async def hits(self, card: Card, lines: list[str]) -> hikari.Message:
+		if not c.hit_pace or len(lines) == 1:
+			return await super().hits(card, lines)
+		full= Card(card.title, "\n".join(lines), card.footer)
+		card.description= lines[0]
+		message= await self.show(card)
+		async def animate():
+			await timers.sleep(c.hit_pace)
+			await self.update(message, full)
+		task= asyncio.ensure_future(animate())
+		self.tasks.add(task)
+		task.add_done_callback(self.tasks.discard)
+		return message
+
+	async def choose(self, card: Card, emojis: list[str]) -> Choice:
+		message= await self.show(card)
+		# votes arrive through reaction events (see votes.py), the message is never fetched
+		votes.collector.open(message.id, emojis, self.s.members*0.75)
+		# add emoji reactions
+		for emoji in emojis:
+			await self.app.rest.add_reaction(message= message, channel= self.s.channel, emoji= hikari.Emoji.parse(emoji))
+		# wait for 75% of participating members to agree, or 30 seconds
+		return await votes.collector.wait(message.id, 30)
+
+	# player turns edit the status message in place: the card and this turn's option buttons in one edit.
+	# buttons are interactions, so there are no reactions to add or clear between turns
+	async def hud(self, card: Card, emojis: list[str]) -> Choice:
+		if not c.battle_hud:
+			return await self.choose(card, emojis)
+		# open before the buttons show, so early presses aren't missed
+		vote= votes.Vote(emojis, self.s.members*0.75)
+		if self.status is not None:
+			self.view.options(emojis, vote)
+			try:
+				self.status= await self.status.edit(render(card), components= self.view)
+			except hikari.NotFoundError:
+				# deleted, post a new one
+				self.view.stop()
+				self.status= None
+		if self.status is None:
+			self.view= HudView()
+			self.view.options(emojis, vote)
+			self.status= await self.s.channel.send(render(card), components= self.view)
+			await self.view.start(self.status)
+		try:
+			return await vote.wait(30)
+		finally:
+			self.view.vote= None
+
+	# one call per line: speaker name and avatar are per-message overrides.
+	# up to c.dialogue_pipeline lines are sent at once
+	async def dialogue(self, lines: list[tuple[str, str, str]]):
+		if not lines:
+			return
+		await webhooks.get(self)
+		if c.dialogue_pipeline <= 1:
+			for line in lines:
+				await self.say(*line)
+		else:
+			limit= asyncio.Semaphore(c.dialogue_pipeline)
+			async def send(line):
+				async with limit:
+					await self.say(*line)
+			await asyncio.gather(*(send(line) for line in lines))
+
+	# send one dialogue line
+	async def say(self, name: str, avatar: str, text: str):
+		webhook= await webhooks.get(self)
+		try:
+			await self.app.rest.execute_webhook(webhook, webhook.token, text, username= name, avatar_url= avatar or hikari.UNDEFINED)
+		except hikari.NotFoundError:
+			# deleted since it was cached, make a new one
+			webhooks.drop(self)
+			webhook= await webhooks.get(self)
+			await self.app.rest.execute_webhook(webhook, webhook.token, text, username= name, avatar_url= avatar or hikari.UNDEFINED)
+
+	async def pause(self, seconds: float):
+		await timers.sleep(seconds)
+
+	async def save(self):
+		await sql_tools.aQueueSave(self.s.guild, self.s.save)
+
+	# write out coalesced saves, take the buttons off the status message
+	async def finish(self):
+		await sql_tools.aFlush(self.s.guild)
+		if self.view is not None:
+			self.view.stop()
+			try:
+				await self.status.edit(components= [])
+			except hikari.NotFoundError:
+				pass
@@ -1,50 +1,51 @@
 import re
 import os
-import json
 import miru
 import asyncio
 import sql_tools
 import config as c
 import interface.views as views
 import interface.gen_comp as comp
+from slipper import NamedList, jsonDump
 from hikari import ButtonStyle, MessageFlag, TextInputStyle
 
 # Battle Editor Panels
 # phase editor panel
 class PhasePanel(views.Panel):
-	def __init__(self):
-		super().__init__(obj= c.save["phases"],
+	def __init__(self, session):
+		super().__init__(obj= session.save["phases"],
 		components= [
 		SpawnEnemies(),
 		comp.DelButton(),
 		Advanced()
-		])
+		],
+		session= session)
 	
 	def onEdit(self):
-		if len(c.save["phases"]) > 1:
-			self.embeds= []
-			for i in range(len(c.save["phases"])-1):
-				conditions= c.save["phases"]["names"][i]
-				results= c.save["phases"][i]
-				self.embeds.append(c.StEmbed(title=conditions, description=results))
-						
-		elif len(c.save["enemies"]) > 1:
+		save= self.session.save
+		if save["phases"]:
+			self.embeds= self.paginate(list(save["phases"].items()), self.render)
+		elif save["enemies"]:
 			self.embeds= c.StEmbed(title="An empty battle is a sad one.", description="Spawn enemies into battle with the button below.")
 		else:
 			self.embeds= c.StEmbed(title="An empty battle is a sad one.", description="Add enemies to the enemy list, then return to spawn them to the battlefield.")
+	
+	def render(self, conditions: str, results: str):
+		return c.StEmbed(title=conditions, description=results)
 
 # enemy editor panel
 class EnemyPanel(views.Panel):
-	def __init__(self):
-		obj= c.save["enemies"]
+	def __init__(self, session):
+		obj= session.save["enemies"]
 		super().__init__(obj= obj,
+		session= session,
 		components= [
-		comp.AddButton(template= {"HP": 5, "POW": 1, "DEF": 0, "SPEED": 0, "STACHE": 0, "spiny": False, "flying": False, "moves": {"names":[]}},
+		comp.AddButton(template= {"HP": 5, "POW": 1, "DEF": 0, "SPEED": 0, "STACHE": 0, "spiny": False, "flying": False, "moves": NamedList()},
 		title= "New Enemy"
 		),
 		comp.UIEdit(
 		items= [
-		comp.NameButton(),
+		comp.NameButton(enemy= True),
 		comp.StatButton(),
 		comp.ToggleButton("spiny", "Spiny"),
 		comp.ToggleButton("flying", "Flying")
@@ -55,25 +56,25 @@ class EnemyPanel(views.Panel):
 		])
 	
 	def onEdit(self):
-		enemies = c.save["enemies"]
-		if len(enemies) > 1:
-			self.embeds = []
-			for i in range(len(enemies)-1):
-				name= enemies["names"][i]
-				enemy= enemies[i]
-				info= f"HP: {enemy.get('HP')}\nPOW: {enemy.get('POW')}\nDEF: {enemy.get('DEF')}\nSpeed: {enemy.get('SPEED')}\nStache: {enemy.get('STACHE')}\nSpiny: {enemy.get('spiny')}\nFlying: {enemy.get('flying')}"
-				self.embeds.append(c.StEmbed(title= name, description= info))
+		enemies = self.session.save["enemies"]
+		if enemies:
+			self.embeds= self.paginate(list(enemies.items()), self.render)
 		else:
 			self.embeds= c.StEmbed(title="No enemies.", description="Add an enemy with the button below.")
 	
+	def render(self, name: str, enemy: dict):
+		info= f"HP: {enemy.get('HP')}\nPOW: {enemy.get('POW')}\nDEF: {enemy.get('DEF')}\nSpeed: {enemy.get('SPEED')}\nStache: {enemy.get('STACHE')}\nSpiny: {enemy.get('spiny')}\nFlying: {enemy.get('flying')}"
+		return c.StEmbed(title= name, description= info)
+	
 # character editor panel
 class CharPanel(views.Panel):
-	def __init__(self):
+	def __init__(self, session):
 		inputs=[
 			miru.TextInput(label="Name", placeholder="Input name.", required=True, max_length=30),
 			miru.TextInput(label="Icon URL", placeholder="Input icon URL.", required=True, max_length=100)
 		]
-		super().__init__(obj= c.save["dialogue"]["chars"],
+		super().__init__(obj= session.save["dialogue"]["chars"],
+		session= session,
 		components= [
 		comp.AddButton(
 		title= "Add Character",
@@ -90,23 +91,23 @@ class CharPanel(views.Panel):
 		])
 	
 	def onEdit(self):
-		chars= c.save["dialogue"]["chars"]
-		if len(chars) > 1:
-			self.embeds= []
-			for i in range(len(chars)-1):
-				name= chars["names"][i]
-				url= chars[i]
-				nEmbed= c.StEmbed(title= name)
-				nEmbed.set_thumbnail(url)
-				self.embeds.append(nEmbed)
+		chars= self.session.save["dialogue"]["chars"]
+		if chars:
+			self.embeds= self.paginate(list(chars.items()), self.render)
 		else:
 			self.embeds= c.StEmbed(title="No characters.", description="Add a character to use for dialogue events!")
+	
+	def render(self, name: str, url: str):
+		nEmbed= c.StEmbed(title= name)
+		nEmbed.set_thumbnail(url)
+		return nEmbed
 			
 # dialogue event editor panel
 class EventPanel(views.Panel):
-	def __init__(self):
+	def __init__(self, session):
 		inputs= [miru.TextInput(label="Dialogue Event", placeholder='[Character No.]:[Dialogue] (separate by new lines).', style=TextInputStyle.PARAGRAPH, required=True, max_length=500), ]
-		super().__init__(obj= c.save["dialogue"]["events"],
+		super().__init__(obj= session.save["dialogue"]["events"],
+		session= session,
 		components= [
 		EventMod(),
 		EventMod(edit= True),
@@ -117,27 +118,24 @@ class EventPanel(views.Panel):
 	
 	def onEdit(self):
 		# set events list
-		events= c.save["dialogue"]["events"]
+		events= self.session.save["dialogue"]["events"]
 		if events:
-			# set embeds
-			self.embeds= []
-			# for each event in list
-			for event in events:
-				# set embeds for one message
-				dEmbeds= []
-				# for each name
-				for i, content in event:
-					name= c.save["dialogue"]["chars"]["names"][int(i)-1]
-					url= c.save["dialogue"]["chars"][int(i)-1]
-					if url:
-						# create new embed
-						nEmbed= c.StEmbed(title= name, description= f'"{content}"')
-						nEmbed.set_thumbnail(url)
-						dEmbeds.append(nEmbed)
-				# append to embeds
-				self.embeds.append(dEmbeds)
+			chars= self.session.save["dialogue"]["chars"]
+			# one page per event: its lines with the speaker's name and icon
+			self.embeds= self.paginate([(tuple((chars.names[int(line[0])-1], chars[int(line[0])-1], ":".join(str(part) for part in line[1:])) for line in event),) for event in events], self.render)
 		else:
 			self.embeds= c.StEmbed(title="No events.", description="Create a dialogue event below!")
+	
+	# set embeds for one message
+	def render(self, lines: tuple):
+		dEmbeds= []
+		for name, url, content in lines:
+			if url:
+				# create new embed
+				nEmbed= c.StEmbed(title= name, description= f'"{content}"')
+				nEmbed.set_thumbnail(url)
+				dEmbeds.append(nEmbed)
+		return dEmbeds
 
 # Battle Editor Components
 # condition add button: calls modal
@@ -154,7 +152,7 @@ class SpawnEnemies(comp.UIEdit):
 		)
 	
 	def onChange(self):
-		if len(c.save["enemies"]) > 1:
+		if self.view.session.save["enemies"]:
 			self.disabled= False
 		else:
 			self.disabled= True
@@ -169,10 +167,10 @@ class EnemySelect(miru.TextSelect):
 		)
 		
 	def onChange(self):
-		if c.save["enemies"]["names"]:
+		if self.view.session.save["enemies"]:
 			self.disabled= False
 			options= []
-			for i, enemy in enumerate(c.save["enemies"]["names"]):
+			for i, enemy in enumerate(self.view.session.save["enemies"].names):
 				options.append(
 				miru.SelectOption(label= enemy, value= str(i))
 				)
@@ -191,16 +189,15 @@ class EnemySelect(miru.TextSelect):
 		spawn= f"spawn:{int(self.values[0])+1},{list(modal.values)[0].value}"
 		if hasattr(self.view, "num"):
 			out= "&" + spawn
-			c.save["phases"][self.view.num]+= out
+			self.view.session.save["phases"][self.view.num]+= out
 		else:
-			if len(c.save["phases"]) > 1:
+			if self.view.session.save["phases"]:
 				out= "e0:0hp"
 				self.view.num= self.view.page+1
 			else:
 				out= "start"
 				self.view.num= 0
-			c.save["phases"]["names"].append(out)
-			c.save["phases"][self.view.num]= spawn
+			self.view.session.save["phases"].insert(self.view.num, out, spawn)
 		# updating root embed and components
 		await views.updateEmbed(self.view.og)
 		await views.updateComp(self.view, ctx)
@@ -219,10 +216,9 @@ class DelSpawn(comp.DelButton):
 			self.disabled= True
 		
 	async def callback(self, ctx: miru.ViewContext):
-		c.save["phases"][self.view.num]= re.sub(r"&(?!.*&).+$", "", c.save["phases"][self.view.num])
-		if not c.save["phases"][self.view.num]:
-			c.save["phases"].pop(self.view.num)
-			c.save["phases"]["names"].pop(self.view.num)
+		self.view.session.save["phases"][self.view.num]= re.sub(r"&(?!.*&).+$", "", self.view.session.save["phases"][self.view.num])
+		if not self.view.session.save["phases"][self.view.num]:
+			self.view.session.save["phases"].pop(self.view.num)
 			delattr(self.view, "num")
 			await views.updateComp(self.view, ctx)
 			await views.updateComp(self.view.og, ctx)
@@ -246,8 +242,7 @@ class ClearSpawn(miru.Button):
 			self.disabled= True
 			
 	async def callback(self, ctx: miru.ViewContext):
-		c.save["phases"].pop(self.view.num)
-		c.save["phases"]["names"].pop(self.view.num)
+		self.view.session.save["phases"].pop(self.view.num)
 		delattr(self.view, "num")
 		await views.updateComp(self.view, ctx)
 		await views.updateComp(self.view.og, ctx)
@@ -305,14 +300,14 @@ class Moves(miru.Button):
 		)
 		
 	def onChange(self):
-		if len(c.save["enemies"]) > 1:
+		if self.view.session.save["enemies"]:
 			self.disabled = False
 		else:
 			self.disabled = True
 	
 	async def callback(self, ctx: miru.ViewContext):
 		# set move panel
-		self.view.panels[self.view.now]= comp.MovePanel(self.view.page)
+		self.view.panels[self.view.now]= comp.MovePanel(self.view.session, self.view.page)
 		# add back button
 		self.view.panels[self.view.now].comp.append(Back())
 		# swap view
@@ -328,9 +323,9 @@ class Back(miru.Button):
 		
 	async def callback(self, ctx: miru.ViewContext):
 		# reset moves var
-		c.moves={}
+		self.view.session.moves={}
 		# set enemy view items
-		self.view.panels[self.view.now]= EnemyPanel()
+		self.view.panels[self.view.now]= EnemyPanel(self.view.session)
 		# swap view
 		await self.view.swapView(ctx, int(self.view.now))
 		
@@ -343,14 +338,14 @@ class Dialogue(miru.Button):
 		)
 	
 	def onChange(self):
-		if len(c.save["dialogue"]["chars"]) > 1:
+		if self.view.session.save["dialogue"]["chars"]:
 			self.disabled = False
 		else:
 			self.disabled = True
 		
 	async def callback(self, ctx: miru.ViewContext):
 		# set event panel
-		self.view.panels[self.view.now]= EventPanel()
+		self.view.panels[self.view.now]= EventPanel(self.view.session)
 		# swap view
 		await self.view.swapView(ctx, int(self.view.now))
 
@@ -377,14 +372,14 @@ class EventMod(comp.ModalButton):
 		if self.edit:
 			value=""
 			# array to modifiable input
-			for event in c.save["dialogue"]["events"][self.view.page]:
-				value += f"{event[0]}:{event[1]}\n"
+			for event in self.view.session.save["dialogue"]["events"][self.view.page]:
+				value += ":".join(str(part) for part in event)+"\n"
 		else:
 			value= None
 		self.modal.children[0].value= value
 	
 	def onChange(self):
-		if len(c.save["dialogue"]["events"]) > 0:
+		if len(self.view.session.save["dialogue"]["events"]) > 0:
 			self.disabled = False
 		elif self.edit:
 			self.disabled = True
@@ -396,38 +391,39 @@ class EventMod(comp.ModalButton):
 		arr = []
 		# insert into array
 		for dialogue in event.split("\n"):
-			arr.append(dialogue.split(":"))
+			# only the first ":" ends the character number, the text may have more
+			arr.append(dialogue.split(":", 1))
 		# if edit
 		if self.edit:
-			c.save["dialogue"]["events"][self.view.page] = arr
+			self.view.session.save["dialogue"]["events"][self.view.page] = arr
 		else:
-			c.save["dialogue"]["events"].append(arr)
+			self.view.session.save["dialogue"]["events"].append(arr)
 			await views.updateComp(self.view, ctx, range(1, 4))
 		await views.updateEmbed(self.view)
 		
 # duplicate event button
 class DupEvent(comp.DupButton):
 	def onChange(self):
-		if c.save["dialogue"]["events"]:
+		if self.view.session.save["dialogue"]["events"]:
 			self.disabled = False
 		else:
 			self.disabled = True
 	
 	async def callback(self, ctx: miru.ViewContext):
 		# save to new event
-		c.save["dialogue"]["events"].append(c.save["dialogue"]["events"][self.view.page])
+		self.view.session.save["dialogue"]["events"].append(self.view.session.save["dialogue"]["events"][self.view.page])
 		await views.updateEmbed(self.view)
 		
 class DelEvent(comp.DelButton):
 	def onChange(self):
-		if c.save["dialogue"]["events"]:
+		if self.view.session.save["dialogue"]["events"]:
 			self.disabled = False
 		else:
 			self.disabled = True
 	
 	async def callback(self, ctx: miru.ViewContext):
 		# save to new event
-		c.save["dialogue"]["events"].pop(self.view.page)
+		self.view.session.save["dialogue"]["events"].pop(self.view.page)
 		
 		if self.view.page == len(self.view.pages)-1:
 			self.view.page-=1
@@ -445,7 +441,7 @@ class Chars(miru.Button):
 		
 	async def callback(self, ctx: miru.ViewContext):
 		# set character panel
-		self.view.panels[self.view.now]= CharPanel()
+		self.view.panels[self.view.now]= CharPanel(self.view.session)
 		# swap view
 		await self.view.swapView(ctx, int(self.view.now))
 
@@ -463,17 +459,15 @@ class StAdd(miru.Button):
 		view.stop()
 		# if said yes
 		if view.output:
-			battles= sql_tools.loadID(self.view.guild, False)
-			for i, battle in enumerate(battles):
-				if not battle:
-					# save
-					sql_tools.saveID(self.view.guild, c.save, False, i)
-					self.view.output= True
-					await ctx.edit_response(content= "Saved.", components= None)
-					break
-				elif i == 4:
-					self.view.output= False
-					await ctx.edit_response(content= "Max battle capacity reached (5 per server). Battle not saved.", components= None)
+			i= await sql_tools.aFreeSlot(self.view.guild)
+			if i is not None:
+				# save
+				await sql_tools.aSaveBattle(self.view.guild, self.view.session.save, i)
+				self.view.output= True
+				await ctx.edit_response(content= views.savedText(self.view.session.save), components= None)
+			else:
+				self.view.output= False
+				await ctx.edit_response(content= f"Max battle capacity reached ({c.battle_slots} per server). Battle not saved.", components= None)
 			# edit confirmation and delete og
 			await self.view.message.delete()
 			self.view.stop()
@@ -494,7 +488,7 @@ class JsonExport(miru.Button):
 		if view.output:
 			path= os.path.abspath(__file__).replace("btl_comp.py", "btl.json")
 			with open(path, "x") as file:
-				file.write(json.dumps(c.save))
+				file.write(jsonDump(self.view.session.save))
 			try:
 				await asyncio.wait_for(await ctx.respond(attachment= path), timeout=10)
 			except Exception as e:
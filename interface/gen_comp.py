@@ -85,7 +85,7 @@ class ModalButton(miru.Button):
 	
 	# onChange affects button availability
 	def onChange(self):
-		if len(self.view.obj) > 1:
+		if self.view.obj:
 			self.disabled = False
 		else:
 			self.disabled = True
@@ -131,15 +131,12 @@ class AddButton(ModalButton):
 	async def callback(self, ctx: miru.ViewContext):
 		length= len(self.view.panels[self.view.now].comp)
 		await super().callback(ctx)
-		# add name to list
+		# add name and value to list
 		name= list(self.modal.values)[0].value
-		self.view.obj["names"].append(name)
-		i= len(self.view.obj["names"])-1
-		# output to obj
 		if len(self.inputs) == 2:
-			self.view.obj[i]= list(self.modal.values)[1].value
+			self.view.obj.append(name, list(self.modal.values)[1].value)
 		else:
-			self.view.obj[i]= deepcopy(self.temp)
+			self.view.obj.append(name, deepcopy(self.temp))
 		await views.updateComp(self.view, ctx)
 		await views.updateEmbed(self.view)
 		
@@ -159,7 +156,7 @@ class ValueEdit(ModalButton):
 			for i, key in enumerate(self.keys):
 				# key "/r" is root
 				if key == "/r":
-					self.modal.children[i].value= self.view.obj["names"][self.view.page]
+					self.modal.children[i].value= self.view.obj.names[self.view.page]
 				# key "/n" is numbered values
 				elif key == "/n":
 					self.modal.children[i].value= self.view.obj[self.view.page]
@@ -177,7 +174,7 @@ class ValueEdit(ModalButton):
 		for i, key in enumerate(self.keys):
 			value= values[i].value
 			if key == "/r":
-				self.view.obj["names"][self.view.page]= value
+				self.view.obj.rename(self.view.page, value)
 			elif key == "/n":
 				self.view.obj[self.view.page]= value
 			else:
@@ -208,7 +205,7 @@ class UIEdit(miru.Button):
 		
 	# onChange affects button availability
 	def onChange(self):
-		if len(self.view.obj) > 1:
+		if self.view.obj:
 			self.disabled = False
 		else:
 			self.disabled = True
@@ -224,10 +221,11 @@ class UIEdit(miru.Button):
 class GenView(miru.View):
 	def __init__(self, items, og: miru.View, obj: dict= None, timeout: int = 30.0):
 		super().__init__(timeout= timeout)
-		# set og view and page
+		# set og view, page and editor state
 		self.og= og
 		self.page= og.page
 		self.obj= obj
+		self.session= og.session
 		for item in items:
 			self.add_item(item)
 			# edit components
@@ -242,12 +240,12 @@ class GenView(miru.View):
 
 # name(& fp) input button: calls modal
 class NameButton(ValueEdit):
-	def __init__(self):
+	def __init__(self, enemy: bool= False):
 		inputs= [
 			miru.TextInput(label="Name", placeholder="Input name.", required=True, max_length=30),
 		]
 		# adjust according to scenario
-		if c.enemy:
+		if enemy:
 			label= "Name"
 			keys= ["/r", ]
 		else:
@@ -285,20 +283,20 @@ class StatButton(ValueEdit):
 
 # move editor panel
 class MovePanel(views.Panel):
-	def __init__(self, index: int= None):
-		if not c.moves:
-			if c.enemy:
-				self.index= index
-				c.moves= c.save["enemies"][self.index]["moves"]
+	def __init__(self, session, index: int= None):
+		self.index= index
+		if not session.moves:
+			if session.enemy:
+				session.moves= session.save["enemies"][self.index]["moves"]
 			else:
-				c.moves= c.save["moves"]
+				session.moves= session.save["moves"]
 		items= [
 			AddButton(template= {"info": "", "icon": "", "amount": 0, "hits": 1, "cost": 0, "offense": True, "rarity": "Normal", "type": "Ground", "target": "One", "stat": "HP"},
 			title= "New Move"
 			),
 			UIEdit(
 			items= [
-			MoveEdit(),
+			MoveEdit(session.enemy, session.save.get("mode")),
 			ToggleButton("offense", 'Offensive'),
 			SwitchButton(['🚹', '🚻', '❔'], "target",  ["One", "All", "Random"]),
 			SwitchButton(['🔨', '👞', chr(0x1FA84)], "type", ["Ground", "Aerial", "Magic"]),
@@ -307,56 +305,55 @@ class MovePanel(views.Panel):
 			DupButton(),
 			DelButton()
 		]
-		if not c.enemy:
+		if not session.enemy:
 			items[1].items.append(SwitchButton(['🟡', '✨', '💥'], "rarity", ["Normal", "Shiny", "Flashy"]))
-		super().__init__(components= items, obj= c.moves)
+		super().__init__(components= items, obj= session.moves, session= session)
 		
 	def onEdit(self):
-		if c.save.get("mode") == "badge":
+		moves= self.session.moves
+		if self.session.save.get("mode") == "badge":
 			costCh = True
 		else: 
 			costCh = False
-		if c.enemy:
-			c.save["enemies"][self.index]["moves"]= c.moves
+		if self.session.enemy:
+			self.session.save["enemies"][self.index]["moves"]= moves
 		else:
-			c.save["moves"]= c.moves
-		if len(c.moves) > 1:
-			self.embeds= []
-			for i in range(len(c.moves)-1):
-				name= c.moves["names"][i]
-				value= c.moves[i]
-				info= ""
-				if not c.enemy:
-					info= f"Info: {value['info']}\nRarity: {value['rarity']}, Emote: {value['icon']}\n"
-				info+= f"This {value['type']} move "
-				if value["offense"]:
-					if value["stat"] == "HP":
-						info+= f"does {value['amount']} damage to "
-					else:
-						info+= f"decreases {value['amount']} {value['stat']} to "
-				else:
-					if value["stat"] == "HP":
-						info+= f"heals "
-					else:
-						info+= f"increases "
-					info+= f"{value['amount']} {value['stat']} for "
-				if value["target"] == "One":
-					info+= f"one target "
-				elif value["target"] == "All":
-					info+= f"all targets "
-				else:
-					info+= f"a random target "
-				info+= f"and hits {value['hits']} time(s)."
-				if costCh:
-					info+= f"\nFP Cost (Badges Mode): {value['cost']}"
-				embed= c.StEmbed(title=name, description=info)
-				self.embeds.append(embed)
+			self.session.save["moves"]= moves
+		if moves:
+			self.embeds= self.paginate([(name, move, costCh) for name, move in moves.items()], self.render)
 		else:
 			self.embeds= c.StEmbed(title="No moves available.", description="Add a move and it will appear.")
+	
+	def render(self, name: str, value: dict, costCh: bool):
+		info= ""
+		if not self.session.enemy:
+			info= f"Info: {value['info']}\nRarity: {value['rarity']}, Emote: {value['icon']}\n"
+		info+= f"This {value['type']} move "
+		if value["offense"]:
+			if value["stat"] == "HP":
+				info+= f"does {value['amount']} damage to "
+			else:
+				info+= f"decreases {value['amount']} {value['stat']} to "
+		else:
+			if value["stat"] == "HP":
+				info+= f"heals "
+			else:
+				info+= f"increases "
+			info+= f"{value['amount']} {value['stat']} for "
+		if value["target"] == "One":
+			info+= f"one target "
+		elif value["target"] == "All":
+			info+= f"all targets "
+		else:
+			info+= f"a random target "
+		info+= f"and hits {value['hits']} time(s)."
+		if costCh:
+			info+= f"\nFP Cost (Badges Mode): {value['cost']}"
+		return c.StEmbed(title=name, description=info)
 			
 # move edit screen: calls modal
 class MoveEdit(ValueEdit):
-	def __init__(self):
+	def __init__(self, enemy: bool= False, mode: str= None):
 		# set inputs
 		inputs=[
 			miru.TextInput(label="Name", placeholder="Input move name.", max_length=20, required=True),
@@ -367,10 +364,10 @@ class MoveEdit(ValueEdit):
 		# add extra values
 		extra= []
 		eKeys= []
-		if not c.enemy:
+		if not enemy:
 			extra.append(miru.TextInput(label="Info", placeholder="Input move description.", max_length=45, required=True))
 			eKeys.append("info")
-			if c.save.get("mode") == "badge":
+			if mode == "badge":
 				extra.append(miru.TextInput(label="Cost", placeholder="Input FP cost.", max_length=2))
 				eKeys.append("cost")
 			else:
@@ -396,15 +393,14 @@ class DupButton(miru.Button):
 		)
 		
 	def onChange(self):
-		if len(self.view.obj) > 1:
+		if self.view.obj:
 			self.disabled = False
 		else: 
 			self.disabled = True
 			
 	async def callback(self, ctx: miru.ViewContext):
 		# save to new item
-		self.view.obj["names"].append(self.view.obj["names"][self.view.page])
-		self.view.obj[len(self.view.obj)-1] = deepcopy(self.view.obj[self.view.page])
+		self.view.obj.append(self.view.obj.names[self.view.page], deepcopy(self.view.obj[self.view.page]))
 		await views.updateEmbed(self.view)
 
 # generic delete button
@@ -417,18 +413,14 @@ class DelButton(miru.Button):
 		)
 		
 	def onChange(self):
-		if len(self.view.obj) > 1:
+		if self.view.obj:
 			self.disabled = False
 		else: self.disabled = True
 		
 	async def callback(self, ctx: miru.ViewContext) -> None:
 		length= len(self.view.panels[self.view.now].comp)
 		self.view.obj.pop(self.view.page)
-		self.view.obj["names"].pop(self.view.page)
-		if self.view.page == len(self.view.pages)-1:
+		if self.view.page == len(self.view.obj):
 			self.view.page-=1
-		else:
-			for i in range(self.view.page, len(self.view.obj)-1):
-				self.view.obj[i]= self.view.obj.pop(i+1)
 		await views.updateComp(self.view, ctx)
 		await views.updateEmbed(self.view)
\ No newline at end of file
@@ -1,6 +1,6 @@
 import miru
 import sql_tools
-import config as c
+import triggers
 from hikari import ButtonStyle, MessageFlag
 
 # MainView is the main view, all components connect to it
@@ -8,10 +8,12 @@ from hikari import ButtonStyle, MessageFlag
 # if a panel has multiple embeds in the same index, a PageNav interface is included which allows the user to browse through the embeds
 # writing this sucked and i’m unsure if the reason is discord’s api or hikari-miru
 
-# MainView(user(type:User), sequence:panels(type:Panel), sequence:options(type:SelectOption), sequence:sys(type:Component))
+# MainView(user(type:User), sequence:panels(type:Panel), sequence:options(type:SelectOption), sequence:sys(type:Component), session(type:EditorSession))
 class MainView(miru.View):
-	def __init__(self, user, panels, options, sys):
+	def __init__(self, user, panels, options, sys, session):
 		super().__init__()
+		# editor state (what's being edited)
+		self.session= session
 		# current panel
 		self.now=0
 		# all panels
@@ -33,7 +35,7 @@ class MainView(miru.View):
 		self.panels[0].onEdit()
 		self.pages= self.panels[0].embeds
 		# add page navigator if applicable
-		if isinstance(self.pages, list):
+		if paged(self.pages):
 			pageNav(self)
 		# add first view components
 		if isinstance(self.panels[0].comp, list):
@@ -74,7 +76,7 @@ class MainView(miru.View):
 		self.panels[self.now].onEdit()
 		self.pages= self.panels[self.now].embeds
 		# if multiple embeds
-		if isinstance(self.pages, list):
+		if paged(self.pages):
 			# adding page navigation
 			pageNav(self)
 			fEmbed= self.pages[self.page]
@@ -114,14 +116,47 @@ class MainView(miru.View):
 
 # panel class (includes components and embeds)
 class Panel():
-	def __init__(self, components, embeds= None, obj: dict= None):
+	def __init__(self, components, embeds= None, obj: dict= None, session= None):
 		self.obj= obj
 		self.comp= components
 		self.embeds= embeds
+		self.session= session
+		# rendered pages by item content
+		self.cache= {}
 	
 	# runs when embeds are changed
 	def onEdit(self):
 		pass
+	
+	# lazy pages for items (tuples of render() arguments), sharing this panel's cache
+	def paginate(self, items: list, render):
+		# drop pages of items that are long gone
+		if len(self.cache) > 2*len(items)+16:
+			self.cache.clear()
+		return Pages(items, render, self.cache)
+
+# a panel's pages, one per item. pages are rendered when first shown and cached by the item's content,
+# so an edit only re-renders the items it changed
+class Pages:
+	def __init__(self, items: list, render, cache: dict):
+		self.items= items
+		self.render= render
+		self.cache= cache
+	
+	def __len__(self) -> int:
+		return len(self.items)
+	
+	def __getitem__(self, i: int):
+		item= self.items[i]
+		key= repr(item)
+		page= self.cache.get(key)
+		if page is None:
+			page= self.cache[key]= self.render(*item)
+		return page
+
+# if pages has several pages (and needs page navigation)
+def paged(pages) -> bool:
+	return isinstance(pages, (list, Pages))
 
 # view selection
 class ViewSelect(miru.TextSelect):
@@ -147,7 +182,7 @@ async def updateEmbed(view):
 	# initialize
 	view.pages= view.panels[view.now].embeds
 	# determine the embed to display
-	if isinstance(view.pages, list):
+	if paged(view.pages):
 		if not view.nav:
 			# if doesn’t exist, add pageNav
 			pageNav(view)
@@ -286,13 +321,21 @@ class ConfirmView(miru.View):
 	
 	@miru.button(label="Yes", style= ButtonStyle.SUCCESS, emoji=chr(0x2714))
 	async def yesButton(self, button: miru.Button, ctx: miru.ViewContext):
-		c.moves= {}
 		self.output = True
 		
 	@miru.button(label="No", style= ButtonStyle.DANGER, emoji=chr(0x2716))
 	async def noButton(self, button: miru.Button, ctx: miru.ViewContext):
 		await ctx.edit_response(content= "Cancelled.", components= None)
 
+# save confirmation, listing what of the battle won't play
+def savedText(battle: dict) -> str:
+	errors= triggers.check(battle)
+	if not errors:
+		return "Saved."
+	shown= "\n".join(str(e) for e in errors[:10])
+	more= f"\n...and {len(errors)-10} more" if len(errors) > 10 else ""
+	return f"Saved, but some of this battle won't play:\n{shown}{more}"
+
 # save button- view ends after this
 class SaveButton(miru.Button):
 	def __init__(self):
@@ -308,12 +351,12 @@ class SaveButton(miru.Button):
 		# if said yes
 		if view.output:
 			# save
-			if c.enemy:
-				sql_tools.saveID(self.view.guild, c.save, False, self.view.choice)
+			if self.view.session.enemy:
+				await sql_tools.aSaveBattle(self.view.guild, self.view.session.save, self.view.choice)
 			else:
-				sql_tools.saveID(self.view.guild, c.save)
+				await sql_tools.aSaveID(self.view.guild, self.view.session.save)
 			# edit confirmation and delete og
-			await ctx.edit_response(content="Saved.", components= None)
+			await ctx.edit_response(content= savedText(self.view.session.save) if self.view.session.enemy else "Saved.", components= None)
 			await self.view.message.delete()
 			self.view.stop()
 
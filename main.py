@@ -1,6 +1,10 @@
+import hikari
 import lightbulb
 import miru
 import time
+import sql_tools
+import timers
+import btl_logic
 
 bot = lightbulb.BotApp(token="[insert token here]")
 miru.install(bot)
@@ -21,6 +25,34 @@ async def reload(ctx: lightbulb.Context) -> None:
 	bot.reload_extensions(ctx.options.extension)
 	await ctx.respond(content= f"Reloaded {ctx.options.extension}.")
 
+@bot.command
+@lightbulb.add_checks(lightbulb.owner_only)
+@lightbulb.command("dbstats", "[BOT ADMIN] Show database queue, latency and cache stats.", ephemeral= True)
+@lightbulb.implements(lightbulb.SlashCommand)
+async def dbstats(ctx: lightbulb.Context) -> None:
+	stats= sql_tools.worker.stats()
+	cache= sql_tools.cache.stats()
+	await ctx.respond(content= f"Queue: {stats['depth']} (peak {stats['peak']})\nCalls: {stats['calls']}\nLatency: {stats['avg_ms']:.2f}ms avg, {stats['worst_ms']:.2f}ms worst\nCache: {cache['size']} guilds, {cache['hits']} hits, {cache['misses']} misses ({cache['ratio']:.0%})")
+
+@bot.command
+@lightbulb.add_checks(lightbulb.owner_only)
+@lightbulb.command("lag", "[BOT ADMIN] Show event loop lag and pending timers.", ephemeral= True)
+@lightbulb.implements(lightbulb.SlashCommand)
+async def lag(ctx: lightbulb.Context) -> None:
+	stats= timers.scheduler.stats()
+	await ctx.respond(content= f"Loop lag: {stats['lag_ms']:.2f}ms (peak {stats['peak_ms']:.2f}ms)\nPending timers: {stats['pending']}")
+
+# start the loop lag gauge, load the move templates
+@bot.listen(hikari.StartedEvent)
+async def on_started(event: hikari.StartedEvent) -> None:
+	timers.scheduler.start_monitor()
+	btl_logic.catalog.load()
+
+# write out queued saves before shutting down
+@bot.listen(hikari.StoppingEvent)
+async def on_stopping(event: hikari.StoppingEvent) -> None:
+	await sql_tools.aFlush()
+
 bot.load_extensions("commands.luigi")
 bot.load_extensions("commands.settings")
 bot.load_extensions("commands.battle")
@@ -0,0 +1,100 @@
+# the battle engine (btl_logic.py) talks to players only through a port: prompts go in, decisions and events come out.
+# discord_port.py is the bot's adapter. FakePort runs battles in-process (tests, replays, simulation)
+
+# what the engine shows: a title/description/footer card, like an embed
+class Card:
+	__slots__= ("title", "description", "footer")
+
+	def __init__(self, title: str= None, description: str= None, footer: str= None):
+		self.title= title
+		self.description= description
+		self.footer= footer
+
+	def __repr__(self) -> str:
+		return f"Card({self.title!r}, {self.description!r})"
+
+# the players' decision on a prompt. nobody deciding is id 0, emoji None, count 0
+class Choice:
+	__slots__= ("id", "emoji", "count")
+
+	def __init__(self, id: int= 0, emoji: str= None, count: int= 0):
+		# option index
+		self.id= id
+		# option emoji
+		self.emoji= emoji
+		# players who picked it
+		self.count= count
+
+# what an adapter has to implement
+class Port:
+	# show a card or plain text. returns a handle for update()
+	async def show(self, out: Card | str):
+		raise NotImplementedError
+
+	# replace something shown. returns the new handle
+	async def update(self, handle, out: Card | str):
+		raise NotImplementedError
+
+	# show an action's result, one line per hit. adapters may animate it with at most one update, without blocking
+	async def hits(self, card: Card, lines: list[str]):
+		card.description= "\n".join(lines)
+		return await self.show(card)
+
+	# show a prompt with one emoji per option, return the players' choice
+	async def choose(self, card: Card, emojis: list[str]) -> Choice:
+		raise NotImplementedError
+
+	# a player turn prompt on the battle's status display. adapters may keep one per battle and update it in place
+	async def hud(self, card: Card, emojis: list[str]) -> Choice:
+		return await self.choose(card, emojis)
+
+	# play a dialogue event: (speaker name, avatar url, text) per line
+	async def dialogue(self, lines: list[tuple[str, str, str]]):
+		raise NotImplementedError
+
+	# pacing between messages
+	async def pause(self, seconds: float):
+		raise NotImplementedError
+
+	# the guild settings (coins, player stats...) changed
+	async def save(self):
+		raise NotImplementedError
+
+	# the battle is over
+	async def finish(self):
+		raise NotImplementedError
+
+# in-process port: decide(card, emojis) returns an option index (None for no vote), everything shown is kept in log
+class FakePort(Port):
+	def __init__(self, decide= None):
+		self.decide= decide or (lambda card, emojis: 0)
+		self.log= []
+		self.saves= 0
+		self.finished= False
+
+	async def show(self, out: Card | str) -> int:
+		self.log.append(out)
+		return len(self.log)-1
+
+	async def update(self, handle: int, out: Card | str) -> int:
+		self.log[handle]= out
+		return handle
+
+	async def choose(self, card: Card, emojis: list[str]) -> Choice:
+		self.log.append(card)
+		i= self.decide(card, emojis)
+		if i is None:
+			return Choice()
+		return Choice(i, emojis[i], 1)
+
+	async def dialogue(self, lines: list[tuple[str, str, str]]):
+		self.log.extend(lines)
+
+	async def pause(self, seconds: float):
+		pass
+
+	async def save(self):
+		self.saves+= 1
+
+	async def finish(self):
+		self.finished= True
@@ -0,0 +1,90 @@
+# how Actions change stats. the battle engine resolves one target at a time with damage()/restore(),
+# simulations resolve many at once with StatBlock.apply(). numpy is optional: without it apply() loops in Python, with the same results
+try:
+	import numpy as np
+except ImportError:
+	np= None
+
+STATS= ["HP", "FP", "POW", "DEF", "SPEED", "STACHE"]
+# stats that can't be restored past their max
+CAPPED= {"HP": "maxHP", "FP": "maxFP"}
+
+# damage of one offensive hit. blocking halves it
+def damage(pow: int, amount: int, DEF: int, blocked: bool) -> int:
+	return round((pow + amount - DEF)*(0.5 if blocked else 1))
+
+# stat after restoring gain, capped at maximum (None for no cap)
+def restore(stat: int, gain: int, maximum: int= None) -> int:
+	calc= stat+gain
+	if maximum is not None and calc > maximum:
+		return maximum
+	return calc
+
+# scalar or per-application value
+def pick(value, i: int):
+	if isinstance(value, (bool, int, float)):
+		return value
+	return value[i]
+
+# stats of many combatants (e.g. the same lineup across many simulated battles), one array per stat
+class StatBlock:
+	def __init__(self, stats: dict, numpy: bool= True):
+		self.numpy= numpy and np is not None
+		self.size= len(stats["HP"])
+		for name in STATS+list(CAPPED.values()):
+			values= stats.get(name, [0]*self.size)
+			setattr(self, name, np.array(values, dtype= np.int64) if self.numpy else [int(value) for value in values])
+
+	# from Beings
+	@classmethod
+	def of(cls, beings: list, numpy: bool= True):
+		return cls({name: [getattr(guy, name) for guy in beings] for name in STATS+list(CAPPED.values())}, numpy)
+
+	# copy stats back to Beings
+	def write(self, beings: list):
+		for name in STATS:
+			values= getattr(self, name)
+			for i, guy in enumerate(beings):
+				setattr(guy, name, int(values[i]))
+
+	# one stat as a plain list
+	def values(self, name: str) -> list:
+		values= getattr(self, name)
+		return values.tolist() if self.numpy else list(values)
+
+	def copy(self, numpy: bool= None):
+		return StatBlock({name: list(getattr(self, name)) for name in STATS+list(CAPPED.values())}, self.numpy if numpy is None else numpy)
+
+	# apply move to the rows in targets (repeats allowed). pow (sender POW) and blocked are scalars or one per target.
+	# every application sees the stats from before the call. returns the damage/gain per hit of each application
+	def apply(self, move, targets, pow= 0, blocked= False):
+		if self.numpy:
+			return self.applyNumpy(move, targets, pow, blocked)
+		stat= getattr(self, move.stat)
+		if move.offense:
+			dmg= [damage(pick(pow, i), move.amount, self.DEF[row], pick(blocked, i)) for i, row in enumerate(targets)]
+			for i, row in enumerate(targets):
+				stat[row]-= dmg[i]*move.hits
+		else:
+			dmg= [move.amount]*len(targets)
+			for row in targets:
+				stat[row]+= move.amount*move.hits
+			if move.stat in CAPPED:
+				maximum= getattr(self, CAPPED[move.stat])
+				for row in targets:
+					stat[row]= min(stat[row], maximum[row])
+		return dmg
+
+	def applyNumpy(self, move, targets, pow, blocked):
+		rows= np.asarray(targets, dtype= np.intp)
+		stat= getattr(self, move.stat)
+		if move.offense:
+			# np.round rounds halves to even, like round()
+			dmg= np.round((np.asarray(pow) + move.amount - self.DEF[rows])*np.where(blocked, 0.5, 1.0)).astype(np.int64)
+			np.subtract.at(stat, rows, dmg*move.hits)
+		else:
+			dmg= np.full(len(rows), move.amount, dtype= np.int64)
+			np.add.at(stat, rows, move.amount*move.hits)
+			if move.stat in CAPPED:
+				stat[rows]= np.minimum(stat[rows], getattr(self, CAPPED[move.stat])[rows])
+		return dmg
@@ -0,0 +1,70 @@
+import config as c
+import triggers
+# per-battle and per-editor state. each running battle/editor owns one session, so guilds don't share data
+
+# state of one battle, in one channel
+class BattleSession:
+	def __init__(self, guild: str, channel= None):
+		self.guild= guild
+		# channel the battle is hosted in
+		self.channel= channel
+		# guild settings
+		self.save= {}
+		# stickers available in this battle (special + custom, see btl_logic.GuildMoves)
+		self.moves= None
+		# the battle being played
+		self.battle= {}
+		# enemy id -> Actions shared by every spawned copy
+		self.actions= {}
+		# its phases, compiled and indexed at battle start (see triggers.py)
+		self.phases= triggers.PhaseIndex()
+		# tracking win/lose conditions
+		self.win= False
+		self.lose= False
+		# number of players who joined
+		self.members= 0
+		# where the battle is shown and decided (see ports.py)
+		self.port= None
+		# dialogue events as (speaker, avatar, text) lines, compiled at battle start
+		self.events= []
+		# combatants and turn order, set when the battle starts (see turns.py)
+		self.queue= None
+
+# state of one settings/battle editor
+class EditorSession:
+	def __init__(self, guild: str, save: dict, enemy: bool= False):
+		self.guild= guild
+		# settings or battle being edited
+		self.save= save
+		# move pool currently open in the move editor
+		self.moves= {}
+		# True when editing a battle (enemy moves), False for settings
+		self.enemy= enemy
+
+# raised when a battle can't be admitted
+class SessionError(Exception):
+	pass
+
+# running battles, keyed by channel id. limits how many run at once
+class SessionRegistry:
+	def __init__(self, cap: int= 100):
+		self.cap= cap
+		self.battles= {}
+
+	def open(self, guild: str, channel) -> BattleSession:
+		if channel.id in self.battles:
+			raise SessionError("A battle is already running in that channel!")
+		if len(self.battles) >= self.cap:
+			raise SessionError("Starlow is hosting too many battles right now. Try again in a bit!")
+		session= BattleSession(guild, channel)
+		self.battles[channel.id]= session
+		return session
+
+	def close(self, session: BattleSession):
+		if self.battles.get(session.channel.id) is session:
+			self.battles.pop(session.channel.id)
+
+	def get(self, channel_id) -> BattleSession | None:
+		return self.battles.get(channel_id)
+
+sessions= SessionRegistry(c.max_battles)
@@ -0,0 +1,273 @@
+# battle balancing: plays a battle many times headlessly (FakePort) with random decisions, on every core
+# usage: python simulate.py (--file battle.json | --guild ID --slot N) [-n 10000] [--workers N] [--block 0.5] [--max-turns 100] [--seed 0] [--lockstep]
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import statistics
+from copy import deepcopy
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import btl_logic as btl
+import resolve
+import triggers
+from ports import FakePort
+from session import BattleSession
+from slipper import NamedList, jsonStr
+
+# settings used when no guild is given (same as a fresh /settings)
+SAVE= {"mode": "sticker", "coins": 100, "hideHP": False, "luigi": True, "reward": {"items": ["HP"], "set": "All"}, "channel": "", "player": {"name": "Mario", "HP": 10, "FP": 5, "POW": 1, "DEF": 0, "SPEED": 0, "STACHE": 0}, "moves": NamedList()}
+
+# raised when a battle runs past the turn limit
+class Stalemate(Exception):
+	pass
+
+# random player: any option on every prompt, blocks with the given chance. records HP at the start of each player turn
+class SimPort(FakePort):
+	def __init__(self, s: BattleSession, block: float, limit: int):
+		super().__init__(self.pick)
+		self.s= s
+		self.block= block
+		self.limit= limit
+		self.turns= 0
+		# (player HP, enemies' HP) per player turn
+		self.curve= []
+
+	def pick(self, card, emojis: list[str]) -> int | None:
+		if card.title == "Block the attack!":
+			return 0 if random.random() < self.block else None
+		if card.title and card.title.endswith("'s Turn!"):
+			self.turns+= 1
+			if self.turns > self.limit:
+				raise Stalemate()
+			queue= self.s.queue
+			self.curve.append((queue.player.HP/queue.player.maxHP, sum(guy.HP for guy in queue.enemies())))
+		return random.randrange(len(emojis))
+
+	# nothing shown is kept
+	async def show(self, out) -> int:
+		return 0
+
+	async def update(self, handle, out) -> int:
+		return 0
+
+	async def dialogue(self, lines: list):
+		pass
+
+# totals of a run of battles. merged across workers
+class Tally:
+	def __init__(self, turns: int):
+		self.outcomes= Counter()
+		# player turns a battle took -> battles
+		self.lengths= Counter()
+		# per player turn: battles that reached it, summed player HP fraction, summed enemy HP
+		self.reached= [0]*turns
+		self.playerHP= [0.0]*turns
+		self.enemyHP= [0.0]*turns
+
+	# curve: (player HP fraction, enemies' HP) per player turn
+	def add(self, outcome: str, turns: int, curve: list):
+		self.outcomes[outcome]+= 1
+		self.lengths[turns]+= 1
+		for i, (player, enemies) in enumerate(curve[:len(self.reached)]):
+			self.reached[i]+= 1
+			self.playerHP[i]+= player
+			self.enemyHP[i]+= enemies
+
+	def merge(self, other):
+		self.outcomes+= other.outcomes
+		self.lengths+= other.lengths
+		for i in range(len(self.reached)):
+			self.reached[i]+= other.reached[i]
+			self.playerHP[i]+= other.playerHP[i]
+			self.enemyHP[i]+= other.enemyHP[i]
+
+async def play(battle: dict, save: dict, block: float, limit: int) -> tuple[str, SimPort]:
+	s= BattleSession("sim")
+	s.battle= battle
+	s.save= deepcopy(save)
+	s.moves= btl.GuildMoves(btl.catalog.get("special"), s.save["moves"])
+	s.members= 1
+	s.port= SimPort(s, block, limit)
+	try:
+		await btl.turn_order(s)
+	except Stalemate:
+		return "stalemate", s.port
+	except Exception as e:
+		return f"error: {type(e).__name__}: {e}", s.port
+	return "win" if s.win else "lose", s.port
+
+# one worker's share of the battles
+def run(battle: dict, save: dict, seeds: range, block: float, limit: int) -> Tally:
+	async def runAll():
+		tally= Tally(limit)
+		for seed in seeds:
+			random.seed(seed)
+			outcome, port= await play(battle, save, block, limit)
+			tally.add(outcome, port.turns, port.curve)
+		return tally
+	return asyncio.run(runAll())
+
+def simulate(battle: dict, save: dict, n: int, workers: int= None, block: float= 0.5, limit: int= 100, seed: int= 0) -> Tally:
+	workers= workers or os.cpu_count()
+	with ProcessPoolExecutor(workers) as pool:
+		# a few chunks per worker, so uneven battle lengths even out
+		chunks= min(n, workers*4)
+		bounds= [seed+n*i//chunks for i in range(chunks+1)]
+		futures= [pool.submit(run, battle, save, range(bounds[i], bounds[i+1]), block, limit) for i in range(chunks)]
+		tally= Tally(limit)
+		for future in futures:
+			tally.merge(future.result())
+	return tally
+
+# enemy ids spawned by the phases met when the battle starts
+def lineup(battle: dict) -> list[int]:
+	phases= triggers.compile_phases(battle)[0]
+	state= triggers.State(1, True, [])
+	ids= []
+	for phase in phases:
+		if phase.met(state):
+			for result in phase.results:
+				if result[0] == "spawn":
+					ids+= [result[1]]*result[2]
+	return ids
+
+# lockstep mode: all n battles play each round together, every move resolved for all of them at once by resolve.StatBlock
+# rougher than simulate(): only the starting lineup, no phases after the start, Jump/Hammer only, and the player acts before the enemies
+def lockstep(battle: dict, save: dict, n: int, block: float= 0.5, limit: int= 100, seed: int= 0, numpy: bool= True) -> Tally:
+	rng= random.Random(seed)
+	basic= btl.catalog.get("basic").actions
+	ids= lineup(battle)
+	if not ids:
+		raise ValueError("nothing spawns when the battle starts")
+	enemies= [battle["enemies"][id] for id in ids]
+	beings= [btl.Being(save["player"])]+[btl.Being(enemy) for enemy in enemies]
+	moves= [tuple(btl.Action(move, name) for name, move in enemy["moves"].items()) for enemy in enemies]
+	# rows of battle b: b*k is the player, b*k+1+j enemy j
+	k= len(beings)
+	stats= resolve.StatBlock.of(beings*n, numpy)
+	tally= Tally(limit)
+	curves= [[] for b in range(n)]
+	playing= list(range(n))
+	turns= 0
+	while playing:
+		turns+= 1
+		if turns > limit:
+			for b in playing:
+				tally.add("stalemate", turns, curves[b])
+			break
+		HP= stats.values("HP")
+		for b in playing:
+			curves[b].append((HP[b*k]/beings[0].maxHP, sum(max(0, HP[b*k+1+j]) for j in range(k-1))))
+		# player turn: Jump or Hammer at a random enemy still standing
+		targets= ([], [])
+		for b in playing:
+			i= rng.randrange(2)
+			row= rng.choice([b*k+1+j for j in range(k-1) if HP[b*k+1+j] > 0])
+			enemy= enemies[row%k-1]
+			if basic[i].type == "Aerial" and enemy["spiny"]:
+				# spines, like deploy_action
+				stats.HP[row]-= 1
+			elif basic[i].type == "Ground" and enemy["flying"]:
+				continue
+			else:
+				targets[i].append(row)
+		POW= stats.values("POW")
+		for i, rows in enumerate(targets):
+			if rows:
+				stats.apply(basic[i], rows, [POW[row-row%k] for row in rows])
+		HP= stats.values("HP")
+		going= []
+		for b in playing:
+			if all(HP[b*k+1+j] <= 0 for j in range(k-1)):
+				tally.add("win", turns, curves[b])
+			else:
+				going.append(b)
+		playing= going
+		# enemy turns, in lineup order. one block decision per battle each round
+		guarded= {b: rng.random() < block for b in playing}
+		for j in range(k-1):
+			if not moves[j]:
+				continue
+			# move index -> (target rows, sender POW, blocked)
+			groups= {}
+			HP= stats.values("HP")
+			POW= stats.values("POW")
+			for b in playing:
+				row= b*k+1+j
+				if HP[row] <= 0 or HP[b*k] <= 0:
+					continue
+				i= rng.randrange(len(moves[j]))
+				move= moves[j][i]
+				if move.offense:
+					rows= [b*k]
+				elif move.target == "All":
+					rows= [b*k+1+other for other in range(k-1) if HP[b*k+1+other] > 0]
+				else:
+					rows= [rng.choice([b*k+1+other for other in range(k-1) if HP[b*k+1+other] > 0])]
+				group= groups.setdefault(i, ([], [], []))
+				group[0].extend(rows)
+				group[1].extend([POW[row]]*len(rows))
+				group[2].extend([guarded[b]]*len(rows))
+			for i, (rows, pow, blocked) in groups.items():
+				stats.apply(moves[j][i], rows, pow, blocked)
+		HP= stats.values("HP")
+		going= []
+		for b in playing:
+			if HP[b*k] <= 0:
+				tally.add("lose", turns, curves[b])
+			else:
+				going.append(b)
+		playing= going
+	return tally
+
+def report(tally: Tally, n: int):
+	for outcome, count in tally.outcomes.most_common():
+		print(f"{outcome}: {count/n:.1%}")
+	lengths= sorted(tally.lengths.elements())
+	print(f"\nplayer turns: min {lengths[0]}, median {statistics.median(lengths):g}, p90 {lengths[min(len(lengths)-1, int(len(lengths)*0.9))]}, max {lengths[-1]}")
+	top= max(tally.lengths.values())
+	for turns in range(lengths[0], lengths[-1]+1):
+		count= tally.lengths[turns]
+		if count:
+			print(f"{turns:>4} | {'#'*max(1, round(40*count/top))} {count}")
+	print("\nturn | battles | player HP | enemy HP")
+	for i, reached in enumerate(tally.reached):
+		if not reached:
+			break
+		print(f"{i+1:>4} | {reached:>7} | {tally.playerHP[i]/reached:>8.0%} | {tally.enemyHP[i]/reached:>8.1f}")
+
+if __name__ == "__main__":
+	parser= argparse.ArgumentParser(description= "Play a battle many times with random decisions and report how it goes.")
+	parser.add_argument("--file", help= "exported battle .json")
+	parser.add_argument("--guild", help= "guild id (its settings are used, and --slot picks a saved battle)")
+	parser.add_argument("--slot", type= int, help= "battle slot, 1-based")
+	parser.add_argument("-n", type= int, default= 10000, help= "battles to play")
+	parser.add_argument("--workers", type= int, default= None, help= "processes (default: every core)")
+	parser.add_argument("--block", type= float, default= 0.5, help= "chance that players block an attack")
+	parser.add_argument("--max-turns", type= int, default= 100, help= "player turns before a battle counts as a stalemate")
+	parser.add_argument("--seed", type= int, default= 0)
+	parser.add_argument("--lockstep", action= "store_true", help= "play every battle's rounds together in one process, batched by resolve.StatBlock (rougher: starting lineup and Jump/Hammer only)")
+	args= parser.parse_args()
+	save= SAVE
+	if args.guild:
+		import sql_tools
+		save= sql_tools.loadID(args.guild) or SAVE
+	if args.file:
+		with open(args.file, encoding= "utf-8") as f:
+			battle= jsonStr(f.read())
+	elif args.guild and args.slot:
+		battle= sql_tools.loadBattle(args.guild, args.slot-1)
+		if not battle:
+			sys.exit("That slot is empty.")
+	else:
+		parser.error("give a battle with --file, or --guild and --slot")
+	start= time.perf_counter()
+	if args.lockstep:
+		tally= lockstep(battle, save, args.n, args.block, args.max_turns, args.seed)
+	else:
+		tally= simulate(battle, save, args.n, args.workers, args.block, args.max_turns, args.seed)
+	print(f"{args.n} battles in {time.perf_counter()-start:.2f}s\n")
+	report(tally, args.n)
@@ -1,5 +1,4 @@
 import json
-import re
 # generic Python library
 
 # converts boolean terms to human speak
@@ -8,21 +7,132 @@ def boolTerm(bool: bool) -> str:
 		return "On"
 	return "Off"
 
-# turns num keys from string to int
+# turns num keys from string to int, as each object is parsed
+# only all-digit keys convert ("0" -> 0); keys like "b1" are left alone
+def intKeys(pairs) -> dict:
+	return {int(key) if key.isdecimal() else key: value for key, value in pairs}
+
+# ordered named records (moves, enemies, phases, characters): records in a list, names in a parallel list.
+# stored in the legacy layout {"names": [name, ...], 0: record, 1: record, ...}; jsonStr converts it, jsonDump writes it back
+class NamedList:
+	__slots__= ("names", "records", "index", "repair")
+
+	def __init__(self, names: list= None, records: list= None):
+		# edit names through the methods (rename, append...) so the name index stays right
+		self.names= list(names or [])
+		self.records= list(records or [])
+		if len(self.names) != len(self.records):
+			raise ValueError(f"{len(self.names)} names for {len(self.records)} records")
+		# name -> first position, built on the first find()
+		self.index= None
+		# what fromLegacy() had to fix, None if the legacy dict was well-formed
+		self.repair= None
+
+	# is obj a legacy collection (a "names" list)? well-formed ones also have keys 0 to n-1 and nothing else
+	@staticmethod
+	def isLegacy(obj: dict) -> bool:
+		return isinstance(obj.get("names"), list)
+
+	# well-formed dicts convert exactly. in others, names and numbered records are paired in key order:
+	# records without a name get an empty one, names without a record and non-numbered keys are dropped, and repair says so
+	@classmethod
+	def fromLegacy(cls, obj: dict):
+		names= obj["names"]
+		keys= sorted(key for key in obj if isinstance(key, int))
+		out= cls(names[:len(keys)]+[""]*(len(keys)-len(names)), [obj[key] for key in keys])
+		if keys != list(range(len(names))) or len(obj) != len(keys)+1:
+			notes= [f"{len(names)} names for {len(keys)} entries"]
+			if keys != list(range(len(keys))):
+				notes.append(f"entries renumbered from {keys}")
+			if len(names) > len(keys):
+				notes.append(f"dropped names {names[len(keys):]}")
+			elif len(keys) > len(names):
+				notes.append(f"{len(keys)-len(names)} unnamed entries")
+			other= [key for key in obj if key != "names" and not isinstance(key, int)]
+			if other:
+				notes.append(f"dropped keys {other}")
+			out.repair= ", ".join(notes)
+		return out
+
+	# the legacy layout: the exact dict fromLegacy() was given, or its repaired form
+	def legacy(self) -> dict:
+		out= {"names": self.names}
+		for i, record in enumerate(self.records):
+			out[i]= record
+		return out
+
+	def __len__(self) -> int:
+		return len(self.records)
+
+	def __iter__(self):
+		return iter(self.records)
+
+	def __getitem__(self, i: int):
+		return self.records[i]
+
+	def __setitem__(self, i: int, record):
+		self.records[i]= record
+
+	def __eq__(self, other) -> bool:
+		return isinstance(other, NamedList) and self.names == other.names and self.records == other.records
+
+	def __repr__(self) -> str:
+		return f"NamedList({self.names!r}, {self.records!r})"
+
+	# (name, record) pairs
+	def items(self):
+		return zip(self.names, self.records)
+
+	# position of the first record with this name, None if there's none
+	def find(self, name: str) -> int | None:
+		if self.index is None:
+			self.index= {}
+			for i, key in enumerate(self.names):
+				self.index.setdefault(key, i)
+		return self.index.get(name)
+
+	def append(self, name: str, record):
+		self.names.append(name)
+		self.records.append(record)
+		if self.index is not None:
+			self.index.setdefault(name, len(self.names)-1)
+
+	def insert(self, i: int, name: str, record):
+		self.names.insert(i, name)
+		self.records.insert(i, record)
+		self.index= None
+
+	def rename(self, i: int, name: str):
+		self.names[i]= name
+		self.index= None
+
+	# removes and returns (name, record). later records move up one
+	def pop(self, i: int= -1) -> tuple:
+		self.index= None
+		return self.names.pop(i), self.records.pop(i)
+
+# json object hook: num keys as int, legacy collections as NamedList
+def loadPairs(pairs):
+	obj= intKeys(pairs)
+	if NamedList.isLegacy(obj):
+		return NamedList.fromLegacy(obj)
+	return obj
+
+# parses json with num keys as int and collections as NamedList
 def jsonStr(obj) -> dict:
-	if not isinstance(obj, dict):
-		obj= json.loads(obj)
-	nObj= {}
-	for key, value in obj.items():
-		if re.findall(r"\d+", key):
-			nKey= int(key)
-		else:
-			nKey= key
-		if isinstance(value, dict):
-			nObj[nKey]= jsonStr(value)
-		else:
-			nObj[nKey]= value
-	return nObj
+	if isinstance(obj, dict):
+		return loadPairs((str(key), jsonStr(value) if isinstance(value, dict) else value) for key, value in obj.items())
+	return json.loads(obj, object_pairs_hook= loadPairs)
+
+# json.dumps default: NamedList in the legacy layout
+def toLegacy(obj) -> dict:
+	if isinstance(obj, NamedList):
+		return obj.legacy()
+	raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+# writes json that jsonStr reads back
+def jsonDump(obj, **kwargs) -> str:
+	return json.dumps(obj, default= toLegacy, **kwargs)
 
 # takes number index and returns list element
 def num_to_list(obj: int, list: list):
@@ -1,82 +1,383 @@
 import sqlite3
-import json
 import os
-from slipper import jsonStr
+import zlib
+import lzma
+import time
+import asyncio
+import logging
+import threading
+import config as c
+from copy import deepcopy
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from slipper import jsonStr, jsonDump
+
+log= logging.getLogger(__name__)
+
+# sql statements, kept constant so sqlite3's statement cache can reuse them
+CREATE= "CREATE TABLE IF NOT EXISTS server_data (guild_id numeric unique, settings text)"
+# battle slots, one row each. the primary key doubles as the (guild_id, slot) index
+CREATE_BATTLES= "CREATE TABLE IF NOT EXISTS battles (guild_id numeric, slot integer, blob text, PRIMARY KEY (guild_id, slot)) WITHOUT ROWID"
+GET1= "SELECT settings FROM server_data WHERE guild_id = ?"
+SET1= "INSERT INTO server_data (guild_id, settings) VALUES (?, ?) ON CONFLICT(guild_id) DO UPDATE SET settings=excluded.settings"
+GET_SLOT= "SELECT blob FROM battles WHERE guild_id = ? AND slot = ?"
+USED_SLOTS= "SELECT slot FROM battles WHERE guild_id = ? ORDER BY slot"
+SET_SLOT= "INSERT INTO battles (guild_id, slot, blob) VALUES (?, ?, ?) ON CONFLICT(guild_id, slot) DO UPDATE SET blob=excluded.blob"
+# schema version, stored in PRAGMA user_version
+VERSION= 2
+# version byte at the start of compact blobs. rows stored as text are plain json
+ZLIB= 1
+LZMA= 2
+
+# encodes data for storage: compact json, compressed behind a version byte
+# falls back to plain json text when compression is off or doesn't make the row smaller
+def encode(data) -> str | bytes:
+	text= jsonDump(data, separators= (",", ":"))
+	if c.db_compress == "zlib":
+		blob= bytes([ZLIB]) + zlib.compress(text.encode(), 6)
+	elif c.db_compress == "lzma":
+		blob= bytes([LZMA]) + lzma.compress(text.encode(), preset= 6)
+	else:
+		return text
+	if len(blob) < len(text):
+		return blob
+	return text
+
+# decodes a stored row, picking the format from its header
+def decode(blob: str | bytes):
+	if isinstance(blob, str):
+		return jsonStr(blob)
+	if blob[0] == ZLIB:
+		return jsonStr(zlib.decompress(blob[1:]))
+	if blob[0] == LZMA:
+		return jsonStr(lzma.decompress(blob[1:]))
+	raise ValueError(f"Unknown blob version: {blob[0]}")
 
 # stores Starlow data into an sqlite database file
+# one connection is opened on first use and kept for the lifetime of the process
 class StDbAccess():
-	def __init__(self, filename: str= None):
+	def __init__(self, filename: str= None, synchronous: str= "NORMAL"):
 		self.path= filename
+		self.conn= None
+		# sqlite sync mode, FULL syncs on every commit
+		self.synchronous= synchronous
+		# the connection is shared, so queries take turns
+		self.lock= threading.RLock()
+
+	def connect(self) -> sqlite3.Connection:
+		with self.lock:
+			if self.conn is None:
+				# autocommit mode: reads never open (or commit) a transaction
+				self.conn= sqlite3.connect(self.path, isolation_level= None, check_same_thread= False, cached_statements= 32)
+				self.conn.execute("PRAGMA journal_mode=WAL")
+				self.conn.execute(f"PRAGMA synchronous={self.synchronous}")
+				self.conn.execute(CREATE)
+				self.conn.execute(CREATE_BATTLES)
+				self.migrate()
+			return self.conn
 
-	def connect(self):
-		self.conn = sqlite3.connect(self.path)
-		self.conn.execute("CREATE TABLE IF NOT EXISTS server_data (guild_id numeric unique, settings text, b0 text, b1 text, b2 text, b3 text, b4 text)")
+	# bring older database files up to the current layout
+	def migrate(self):
+		version= self.conn.execute("PRAGMA user_version").fetchone()[0]
+		if version >= VERSION:
+			return
+		columns= [row[1] for row in self.conn.execute("PRAGMA table_info(server_data)")]
+		battleColumns= [row[1] for row in self.conn.execute("PRAGMA table_info(battles)")]
+		self.conn.execute("BEGIN")
+		try:
+			# version 1 had a name column on battles that was never filled
+			if "name" in battleColumns:
+				self.conn.execute("ALTER TABLE battles RENAME TO battles_v1")
+				self.conn.execute(CREATE_BATTLES)
+				self.conn.execute("INSERT INTO battles (guild_id, slot, blob) SELECT guild_id, slot, blob FROM battles_v1")
+				self.conn.execute("DROP TABLE battles_v1")
+			# version 0 kept battles in server_data columns b0..b4
+			old= [column for column in ["b0", "b1", "b2", "b3", "b4"] if column in columns]
+			for i, column in enumerate(old):
+				self.conn.execute(f"INSERT OR IGNORE INTO battles (guild_id, slot, blob) SELECT guild_id, {i}, {column} FROM server_data WHERE {column} IS NOT NULL")
+				self.conn.execute(f"UPDATE server_data SET {column}=NULL")
+			self.conn.execute(f"PRAGMA user_version={VERSION}")
+			self.conn.execute("COMMIT")
+		except:
+			self.conn.execute("ROLLBACK")
+			raise
 
 	def close(self):
-		self.conn.commit()
-		self.conn.close()
+		with self.lock:
+			if self.conn is not None:
+				self.conn.close()
+				self.conn= None
 
 	def get1(self, id: str):
-		item = self.conn.execute(f'SELECT settings FROM server_data WHERE guild_id = ?', (id,)).fetchone()
-		self.close()
+		with self.lock:
+			item= self.connect().execute(GET1, (id,)).fetchone()
 		if item:
 			if item[0]:
-				return jsonStr(item[0])
+				return decode(item[0])
 		return None
-	
-	def get2(self, id: str):
-		items= []
-		columns= ["b0", "b1", "b2", "b3", "b4"]
-		for column in columns:
-			item= self.conn.execute(f'SELECT {column} FROM server_data WHERE guild_id = ?', (id,)).fetchone()
-			if item:
-				if item[0]:
-					items.append(jsonStr(item[0]))
-					continue
-			items.append(None)
-		self.close()
-		return items
-	
+
+	# one battle slot, decoded
+	def getSlot(self, id: str, slot: int):
+		with self.lock:
+			item= self.connect().execute(GET_SLOT, (id, slot)).fetchone()
+		if item:
+			if item[0]:
+				return decode(item[0])
+		return None
+
+	# first empty slot below capacity, or None if all are taken. nothing is decoded
+	def freeSlot(self, id: str, capacity: int):
+		with self.lock:
+			used= {row[0] for row in self.connect().execute(USED_SLOTS, (id,))}
+		for slot in range(capacity):
+			if slot not in used:
+				return slot
+		return None
+
 	def set1(self, id: str, obj):
-		self.conn.execute('INSERT OR IGNORE INTO server_data (guild_id) VALUES (?)', (id,))
-		self.conn.execute('UPDATE server_data SET settings=? WHERE guild_id=?', (obj, id))
-		self.close()
-		
-	def set2(self, id: str, obj, index: int= 0):
-		self.conn.execute(f'UPDATE server_data SET b{index}=? WHERE guild_id=?', (obj, id))
-		self.close()
+		with self.lock:
+			self.connect().execute(SET1, (id, obj))
+
+	def setSlot(self, id: str, obj, slot: int= 0):
+		with self.lock:
+			self.connect().execute(SET_SLOT, (id, slot, obj))
+
+# runs database calls on a dedicated thread, so sqlite never blocks the event loop
+class StDbWorker():
+	def __init__(self):
+		self.pool= ThreadPoolExecutor(max_workers= 1, thread_name_prefix= "starlow-db")
+		# calls waiting or running on the db thread
+		self.depth= 0
+		self.peak= 0
+		# completed calls and their latency (queue wait included), in seconds
+		self.calls= 0
+		self.total= 0.0
+		self.worst= 0.0
+
+	async def run(self, func, *args):
+		self.depth+= 1
+		self.peak= max(self.peak, self.depth)
+		start= time.perf_counter()
+		try:
+			return await asyncio.get_running_loop().run_in_executor(self.pool, func, *args)
+		finally:
+			elapsed= time.perf_counter()-start
+			self.depth-= 1
+			self.calls+= 1
+			self.total+= elapsed
+			self.worst= max(self.worst, elapsed)
+
+	# queue depth and latency metrics
+	def stats(self) -> dict:
+		return {
+			"depth": self.depth,
+			"peak": self.peak,
+			"calls": self.calls,
+			"avg_ms": self.total/self.calls*1000 if self.calls else 0.0,
+			"worst_ms": self.worst*1000
+		}
+
+# marks a guild that isn't cached (None means the guild has no settings)
+MISSING= object()
+
+# bounded LRU cache of decoded settings per guild
+# cached objects are shared: copy them before editing
+class StCache():
+	def __init__(self, size: int= 256):
+		self.size= size
+		self.items= OrderedDict()
+		self.hits= 0
+		self.misses= 0
+		self.lock= threading.Lock()
+
+	def get(self, guildID: str):
+		with self.lock:
+			data= self.items.get(str(guildID), MISSING)
+			if data is MISSING:
+				self.misses+= 1
+			else:
+				self.hits+= 1
+				self.items.move_to_end(str(guildID))
+			return data
+
+	def put(self, guildID: str, data: dict | None):
+		with self.lock:
+			self.items[str(guildID)]= data
+			self.items.move_to_end(str(guildID))
+			if len(self.items) > self.size:
+				self.items.popitem(last= False)
+
+	def drop(self, guildID: str):
+		with self.lock:
+			self.items.pop(str(guildID), None)
+
+	def stats(self) -> dict:
+		total= self.hits+self.misses
+		return {
+			"size": len(self.items),
+			"hits": self.hits,
+			"misses": self.misses,
+			"ratio": self.hits/total if total else 0.0
+		}
+
+# coalesces settings saves: a guild is marked dirty, and only its latest data is written once per interval
+class StWriteBuffer():
+	def __init__(self, interval: float= 10):
+		self.interval= interval
+		# guild id -> latest unsaved settings
+		self.dirty= {}
+		# guild id -> saves so far, so a failed write can tell whether a newer save replaced it
+		self.saves= {}
+		self.timer= None
+
+	def mark(self, guildID: str, data: dict):
+		self.dirty[str(guildID)]= data
+		self.saves[str(guildID)]= self.saves.get(str(guildID), 0)+1
+		self.schedule()
+
+	# a direct save replaces anything queued for the guild
+	def supersede(self, guildID: str):
+		self.dirty.pop(str(guildID), None)
+		self.saves[str(guildID)]= self.saves.get(str(guildID), 0)+1
+
+	def schedule(self):
+		if self.timer is None:
+			self.timer= asyncio.get_running_loop().call_later(self.interval, self.due)
+
+	def due(self):
+		self.timer= None
+		asyncio.ensure_future(self.flush()).add_done_callback(self.done)
+
+	# flush() handles its own write errors, anything else is logged rather than lost in the task
+	def done(self, task: asyncio.Task):
+		if not task.cancelled() and task.exception():
+			log.error("settings flush failed", exc_info= task.exception())
+
+	# write one guild, or every dirty guild if none is given
+	# a failed write goes back into dirty for the next flush, unless a newer save replaced it meanwhile
+	async def flush(self, guildID: str= None):
+		if guildID is None:
+			pending= self.dirty
+			self.dirty= {}
+			if self.timer:
+				self.timer.cancel()
+				self.timer= None
+		elif str(guildID) in self.dirty:
+			pending= {str(guildID): self.dirty.pop(str(guildID))}
+		else:
+			return
+		for guild, data in pending.items():
+			count= self.saves.get(guild)
+			try:
+				await worker.run(putSettings, guild, encode(data))
+			except Exception:
+				log.exception(f"saving settings of guild {guild} failed")
+				if self.saves.get(guild) == count:
+					self.dirty[guild]= data
+					self.schedule()
 
 PATH= os.path.abspath(__file__).replace("sql_tools.py", "server_data.db")
 # initialize database
-db = StDbAccess(PATH)
+if c.db_durability == "full":
+	db = StDbAccess(PATH, "FULL")
+else:
+	db = StDbAccess(PATH)
+worker = StDbWorker()
+buffer = StWriteBuffer(c.db_flush)
+cache = StCache(c.db_cache)
+
+# write encoded settings, keeping the cache in step with the disk
+def putSettings(guildID: str, blob: str | bytes):
+	db.set1(guildID, blob)
+	cache.put(guildID, decode(blob))
+
+# read settings from disk into the cache
+def fillSettings(guildID: str) -> dict | None:
+	data= db.get1(guildID)
+	cache.put(guildID, data)
+	return data
+
+# cached settings (shared, don't edit)
+def getSettings(guildID: str) -> dict | None:
+	data= cache.get(guildID)
+	if data is MISSING:
+		data= fillSettings(guildID)
+	return data
 
 # save data to guild id
-def saveID(guildID: str, data: dict, set: bool= True, i: int= 0):
-	global db
-	db.connect()
-	if set:
-		db.set1(guildID, json.dumps(data))
-	else:
-		db.set2(guildID, json.dumps(data), i)
-	print(data)
-	
+def saveID(guildID: str, data: dict):
+	putSettings(guildID, encode(data))
+
 # load data from guild id
-def loadID(guildID: str, set: bool= True) -> dict | None:
-	global db
-	db.connect()
-	if set:
-		data = db.get1(guildID)
-	else:
-		data = db.get2(guildID)
+def loadID(guildID: str) -> dict | None:
+	data = deepcopy(getSettings(guildID))
 	if data:
 		return data
 	else:
 		return None
 
+# save battle to a guild's slot
+def saveBattle(guildID: str, data: dict, slot: int):
+	db.setSlot(guildID, encode(data), slot)
+
+# load battle from a guild's slot
+def loadBattle(guildID: str, slot: int) -> dict | None:
+	return db.getSlot(guildID, slot)
+
+# first empty battle slot, None if the guild is at capacity
+def freeSlot(guildID: str) -> int | None:
+	return db.freeSlot(guildID, c.battle_slots)
+
 # is /luigi enabled?
 def isLuigi(guildID: str) -> bool:
-	global db
-	db.connect()
-	settings = db.get1(guildID)
+	settings = getSettings(guildID)
 	if settings:
-		return settings.get("luigi")
\ No newline at end of file
+		return settings.get("luigi")
+
+# async versions, for use inside commands and components
+# data is encoded on the calling side so the db thread never reads a dict that is being edited
+async def aSaveID(guildID: str, data: dict):
+	# this save supersedes anything still queued
+	buffer.supersede(guildID)
+	await worker.run(putSettings, guildID, encode(data))
+
+# cached settings skip the db thread entirely
+async def aSettings(guildID: str) -> dict | None:
+	# unsaved settings win over the stored ones
+	if str(guildID) in buffer.dirty:
+		return buffer.dirty[str(guildID)]
+	data= cache.get(guildID)
+	if data is MISSING:
+		data= await worker.run(fillSettings, guildID)
+	return data
+
+async def aLoadID(guildID: str) -> dict | None:
+	data= await aSettings(guildID)
+	if data:
+		return deepcopy(data)
+	return None
+
+async def aIsLuigi(guildID: str) -> bool:
+	settings= await aSettings(guildID)
+	if settings:
+		return settings.get("luigi")
+
+async def aSaveBattle(guildID: str, data: dict, slot: int):
+	await worker.run(db.setSlot, guildID, encode(data), slot)
+
+async def aLoadBattle(guildID: str, slot: int) -> dict | None:
+	return await worker.run(loadBattle, guildID, slot)
+
+async def aFreeSlot(guildID: str) -> int | None:
+	return await worker.run(freeSlot, guildID)
+
+# settings save that can be coalesced (battles save often); see config.db_durability
+async def aQueueSave(guildID: str, data: dict):
+	if c.db_durability == "buffered":
+		buffer.mark(guildID, data)
+	else:
+		await aSaveID(guildID, data)
+
+# write out queued saves, of one guild or all of them
+async def aFlush(guildID: str= None):
+	await buffer.flush(guildID)
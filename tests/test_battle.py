@@ -0,0 +1,45 @@
+# whole battles through btl_logic.turn_order, headless on ports.FakePort
+import os
+import sys
+import random
+import asyncio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import btl_logic as btl
+from ports import FakePort
+from session import BattleSession
+from slipper import jsonStr
+
+SAVE= {"mode": "sticker", "coins": 100, "hideHP": False, "luigi": True, "reward": {"items": ["HP"], "set": "All"}, "channel": "", "moves": {"names": []}}
+BONK= {"amount": 1, "hits": 1, "offense": True, "type": "Ground", "target": "One", "stat": "HP"}
+
+# one Goomba with the given stats, won by defeating it
+def battle(**stats) -> dict:
+	goomba= {"HP": 5, "POW": 1, "DEF": 0, "SPEED": 0, "STACHE": 0, "spiny": False, "flying": False, "moves": {"names": ["Bonk"], "0": BONK}}
+	goomba.update(stats)
+	return {"phases": {"names": ["start", "e1<=0hp"], "0": "spawn:1,1", "1": "win"}, "enemies": {"names": ["Goomba"], "0": goomba}}
+
+# plays a battle with random decisions, returns the session
+def play(data: dict, player: dict, seed: int= 0) -> BattleSession:
+	random.seed(seed)
+	s= BattleSession("test")
+	s.battle= jsonStr(data)
+	s.save= jsonStr(SAVE)
+	s.save["player"]= dict({"name": "Mario", "FP": 5, "POW": 1, "DEF": 0, "SPEED": 0, "STACHE": 0}, **player)
+	s.moves= btl.GuildMoves(btl.catalog.get("special"), s.save["moves"])
+	s.members= 1
+	s.port= FakePort(lambda card, emojis: random.randrange(len(emojis)))
+	asyncio.run(asyncio.wait_for(btl.turn_order(s), 30))
+	return s
+
+def test_win():
+	s= play(battle(), {"HP": 30})
+	assert s.win and not s.lose
+	assert "You win!" in s.port.log and s.port.finished
+	# reward set "All" with HP: +5 max HP
+	assert s.save["player"]["HP"] == 35
+
+def test_lose():
+	s= play(battle(HP= 500, POW= 10, SPEED= 5), {"HP": 5})
+	assert s.lose and not s.win
+	assert "You lose." in s.port.log and s.port.finished
+	assert s.save["player"]["HP"] == 5
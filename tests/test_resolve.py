@@ -0,0 +1,50 @@
+# resolve.StatBlock: the numpy path and the pure-Python fallback give the same stats
+import os
+import sys
+import json
+import random
+import pytest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import resolve
+import simulate
+from btl_logic import Action
+from slipper import jsonStr
+
+MOVES= [
+	Action({"amount": 0, "hits": 2, "offense": True, "type": "Aerial", "target": "One", "stat": "HP"}, "Jump"),
+	Action({"amount": 1, "hits": 1, "offense": True, "type": "Ground", "target": "One", "stat": "HP"}, "Hammer"),
+	Action({"amount": 10, "hits": 1, "offense": False, "type": "Magic", "target": "One", "stat": "HP"}, "Mushroom"),
+	Action({"amount": 3, "hits": 1, "offense": False, "type": "Magic", "target": "One", "stat": "FP"}, "Syrup"),
+	Action({"amount": 2, "hits": 1, "offense": True, "type": "Magic", "target": "All", "stat": "DEF"}, "Chill"),
+]
+BATTLE= {"phases": {"names": ["start", "e1<=0hp"], "0": "spawn:1,2", "1": "win"}, "enemies": {"names": ["Goomba"], "0": {"HP": 6, "POW": 1, "DEF": 0, "SPEED": 1, "STACHE": 0, "spiny": False, "flying": False, "moves": {"names": ["Bonk", "Heal"], "0": {"amount": 1, "hits": 1, "offense": True, "type": "Ground", "target": "One", "stat": "HP"}, "1": {"amount": 2, "hits": 1, "offense": False, "type": "Magic", "target": "All", "stat": "HP"}}}}}
+
+def test_numpy_matches_fallback():
+	pytest.importorskip("numpy")
+	rng= random.Random(0)
+	n= 200
+	stats= {name: [rng.randint(0, 5) for i in range(n)] for name in resolve.STATS}
+	stats["HP"]= [rng.randint(10, 40) for i in range(n)]
+	stats["maxHP"]= [hp+rng.randint(0, 10) for hp in stats["HP"]]
+	stats["maxFP"]= [fp+rng.randint(0, 3) for fp in stats["FP"]]
+	fast= resolve.StatBlock(stats, numpy= True)
+	slow= resolve.StatBlock(stats, numpy= False)
+	assert fast.numpy and not slow.numpy
+	for step in range(100):
+		move= rng.choice(MOVES)
+		# repeated rows, halves that round to even, and scalar and per-target pow/blocked
+		targets= [rng.randrange(n) for i in range(rng.randint(1, 50))]
+		pow= rng.choice([rng.randint(0, 5), [rng.randint(0, 5) for row in targets]])
+		blocked= rng.choice([True, False, [rng.random() < 0.5 for row in targets]])
+		assert list(fast.apply(move, targets, pow, blocked)) == list(slow.apply(move, targets, pow, blocked))
+	for name in resolve.STATS:
+		assert fast.values(name) == slow.values(name), name
+
+def test_lockstep_same_either_way():
+	pytest.importorskip("numpy")
+	battle= jsonStr(json.dumps(BATTLE))
+	fast= simulate.lockstep(battle, simulate.SAVE, 500, seed= 1, numpy= True)
+	slow= simulate.lockstep(battle, simulate.SAVE, 500, seed= 1, numpy= False)
+	assert sum(fast.outcomes.values()) == 500
+	assert fast.outcomes == slow.outcomes and fast.lengths == slow.lengths
+	assert fast.playerHP == slow.playerHP and fast.enemyHP == slow.enemyHP
@@ -0,0 +1,35 @@
+# round trips of legacy {"names": [...], 0: ..., 1: ...} collections through slipper's NamedList
+import os
+import sys
+import json
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import triggers
+from slipper import NamedList, jsonStr, jsonDump
+
+GOOMBA= {"HP": 5, "POW": 1, "DEF": 0, "SPEED": 0, "STACHE": 0, "spiny": False, "flying": False, "moves": {"names": ["Bonk"], "0": {"amount": 1, "hits": 1, "offense": True, "type": "Ground", "target": "One", "stat": "HP"}}}
+
+def test_wellformed_round_trip():
+	blob= json.dumps({"phases": {"names": ["start", "e1<=0hp"], "0": "spawn:1,1", "1": "win"}, "enemies": {"names": ["Goomba"], "0": GOOMBA}}, separators= (",", ":"))
+	data= jsonStr(blob)
+	assert isinstance(data["phases"], NamedList) and isinstance(data["enemies"][0]["moves"], NamedList)
+	assert data["phases"].repair is None
+	assert jsonDump(data, separators= (",", ":")) == blob
+
+# what the old spawn button left behind: a name appended at the end, its result written over another phase
+def test_malformed_names_longer():
+	blob= json.dumps({"phases": {"names": ["start", "e1<=0hp", "e0:0hp"], "0": "spawn:1,1", "1": "win"}, "enemies": {"names": ["Goomba"], "0": GOOMBA}})
+	data= jsonStr(blob)
+	phases= data["phases"]
+	assert list(phases.items()) == [("start", "spawn:1,1"), ("e1<=0hp", "win")]
+	assert "dropped names" in phases.repair
+	# reported, and the rest of the battle still compiles
+	assert [str(e) for e in triggers.check(data)] == [f"Phases: {phases.repair}"]
+	# written back well-formed, and read back the same without a repair
+	again= jsonStr(jsonDump(data))
+	assert again["phases"] == phases and again["phases"].repair is None
+
+def test_malformed_gaps_and_unnamed():
+	data= jsonStr(json.dumps({"names": ["a", "c"], "0": "x", "2": "y", "3": "z", "note": 1}))
+	assert list(data.items()) == [("a", "x"), ("c", "y"), ("", "z")]
+	assert "renumbered" in data.repair and "unnamed" in data.repair and "note" in data.repair
+	assert jsonDump(data) == json.dumps({"names": ["a", "c", ""], "0": "x", "1": "y", "2": "z"})
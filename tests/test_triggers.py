@@ -0,0 +1,31 @@
+# compiling phases and dialogue (triggers.py): what won't play is reported when the battle loads, never mid-battle
+import os
+import sys
+import json
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import triggers
+from slipper import jsonStr
+
+GOOMBA= {"HP": 5, "POW": 1, "DEF": 0, "SPEED": 0, "STACHE": 0, "spiny": False, "flying": False, "moves": {"names": ["Bonk"], "0": {"amount": 1, "hits": 1, "offense": True, "type": "Ground", "target": "One", "stat": "HP"}}}
+
+def battle(phases: dict) -> dict:
+	return jsonStr(json.dumps({"phases": {"names": list(phases), **{str(i): result for i, result in enumerate(phases.values())}}, "enemies": {"names": ["Goomba"], "0": GOOMBA}}))
+
+def test_zero_period_rejected():
+	phases, errors= triggers.compile_phases(battle({"start": "spawn:1,1", "t+0": "sys:never", "t+2": "sys:every other turn"}))
+	assert [phase.text for phase in phases] == ["start", "t+2"]
+	assert len(errors) == 1 and isinstance(errors[0], triggers.PhaseError)
+	assert errors[0].index == 1 and "period" in str(errors[0])
+
+def test_period_met():
+	phases= triggers.compile_phases(battle({"t+2": "sys:every other turn"}))[0]
+	met= [turn for turn in range(1, 7) if phases[0].met(triggers.State(turn, False, []))]
+	assert met == [2, 4, 6]
+
+# dialogue lines whose text has ":" in it, as the editor used to split them, play whole
+def test_event_text_with_colons():
+	data= battle({"start": "event1"})
+	data["dialogue"]= jsonStr(json.dumps({"chars": {"names": ["Starlow"], "0": "https://x/a.png"}, "events": [[["1", "Time", " now"], ["1", "Go!"], ["2", "Who?"], ["1"]]]}))
+	events, errors= triggers.compile_events(data)
+	assert events == [(("Starlow", "https://x/a.png", "Time: now"), ("Starlow", "https://x/a.png", "Go!"))]
+	assert [str(e) for e in errors] == ["Event 1, line 3: there's no character 2", "Event 1, line 4: there's no dialogue (write [character no.]:[text])"]
@@ -0,0 +1,30 @@
+# button votes on the battle status message (see votes.Vote.pick)
+import os
+import sys
+import asyncio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import votes
+
+EMOJIS= ["<:st_jump:1136186635839623268>", "<:st_hammer:1136186760041336893>", "📖"]
+
+def test_latest_pick_counts():
+	async def main():
+		vote= votes.Vote(EMOJIS, 3)
+		vote.pick(1, 0)
+		vote.pick(1, 2)
+		vote.pick(2, 2)
+		# one vote per player: 1 changed their mind
+		assert [len(voters) for voters in vote.voters] == [0, 0, 2]
+		vote.finish()
+		return await vote.future
+	choice= asyncio.run(main())
+	assert (choice.id, choice.emoji, choice.count) == (2, "📖", 2)
+
+def test_quorum_ends_early():
+	async def main():
+		vote= votes.Vote(EMOJIS, 1.5)
+		vote.pick(1, 1)
+		vote.pick(2, 1)
+		return await vote.wait(30)
+	choice= asyncio.run(asyncio.wait_for(main(), 5))
+	assert choice.id == 1 and choice.count == 2
@@ -0,0 +1,45 @@
+# failed writes of sql_tools' coalesced settings saves stay queued instead of being dropped
+import os
+import sys
+import sqlite3
+import asyncio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import sql_tools
+
+# queue two guilds and flush them, with writes of the guilds in fail raising after calling during()
+def flush(monkeypatch, buffer, fail, during= None):
+	written= {}
+	def putSettings(guild, blob):
+		if guild in fail:
+			if during:
+				during()
+			raise sqlite3.OperationalError("database is locked")
+		written[guild]= sql_tools.decode(blob)
+	monkeypatch.setattr(sql_tools, "putSettings", putSettings)
+	async def main():
+		buffer.mark("1", {"luigi": True})
+		buffer.mark("2", {"luigi": False})
+		await buffer.flush()
+		if buffer.timer:
+			buffer.timer.cancel()
+	asyncio.run(main())
+	return written
+
+def test_failed_guild_requeued(monkeypatch):
+	buffer= sql_tools.StWriteBuffer(3600)
+	written= flush(monkeypatch, buffer, {"1"})
+	# the other guild is still written
+	assert written == {"2": {"luigi": False}}
+	assert buffer.dirty == {"1": {"luigi": True}}
+
+def test_superseded_failure_dropped(monkeypatch):
+	buffer= sql_tools.StWriteBuffer(3600)
+	# a direct save of guild 1 lands while its queued write is failing
+	written= flush(monkeypatch, buffer, {"1"}, lambda: buffer.supersede("1"))
+	assert written == {"2": {"luigi": False}}
+	assert buffer.dirty == {}
+
+def test_newer_mark_kept(monkeypatch):
+	buffer= sql_tools.StWriteBuffer(3600)
+	flush(monkeypatch, buffer, {"1"}, lambda: buffer.mark("1", {"luigi": False}))
+	assert buffer.dirty == {"1": {"luigi": False}}
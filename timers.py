@@ -0,0 +1,91 @@
+import heapq
+import asyncio
+import itertools
+# shared timer service for battles: registration windows, vote deadlines and pacing
+# never use time.sleep in a command/battle path, it freezes the event loop for every guild
+
+# one timer heap for every battle. only the earliest deadline is armed on the event loop
+class StScheduler():
+	def __init__(self):
+		self.loop= None
+		# (when, seq, future)
+		self.heap= []
+		self.seq= itertools.count()
+		# loop handle of the armed deadline
+		self.handle= None
+		self.armed= None
+		# loop lag gauge (how late timers fire), in seconds
+		self.lag= 0.0
+		self.peak= 0.0
+		self.fired= 0
+		self.monitor= None
+
+	# future resolved after delay seconds
+	def deadline(self, delay: float) -> asyncio.Future:
+		loop= asyncio.get_running_loop()
+		if loop is not self.loop:
+			# new event loop (e.g. restart), old timers can't fire anymore
+			self.loop= loop
+			self.heap= []
+			self.handle= None
+			self.armed= None
+		future= loop.create_future()
+		heapq.heappush(self.heap, (loop.time()+max(delay, 0), next(self.seq), future))
+		self.arm()
+		return future
+
+	# non-blocking replacement of time.sleep
+	async def sleep(self, delay: float):
+		await self.deadline(delay)
+
+	# arm the loop for the earliest deadline
+	def arm(self):
+		if not self.heap:
+			return
+		when= self.heap[0][0]
+		if self.handle is not None:
+			if self.armed <= when:
+				return
+			self.handle.cancel()
+		self.armed= when
+		self.handle= self.loop.call_at(when, self.fire)
+
+	def fire(self):
+		self.handle= None
+		now= self.loop.time()
+		while self.heap and self.heap[0][0] <= now:
+			when, seq, future= heapq.heappop(self.heap)
+			# skip timers whose waiter went away
+			if future.done():
+				continue
+			late= now-when
+			# smoothed lag, plus the worst seen
+			self.lag= self.lag*0.9 + late*0.1
+			self.peak= max(self.peak, late)
+			self.fired+= 1
+			future.set_result(None)
+		self.arm()
+
+	# keeps the lag gauge fresh while no battle is running
+	def start_monitor(self, interval: float= 0.5):
+		async def tick():
+			while True:
+				await self.sleep(interval)
+		if self.monitor is None or self.monitor.done():
+			self.monitor= asyncio.ensure_future(tick())
+
+	def stats(self) -> dict:
+		return {
+			"pending": len(self.heap),
+			"fired": self.fired,
+			"lag_ms": self.lag*1000,
+			"peak_ms": self.peak*1000
+		}
+
+scheduler= StScheduler()
+
+async def sleep(delay: float):
+	await scheduler.sleep(delay)
+
+def deadline(delay: float) -> asyncio.Future:
+	return scheduler.deadline(delay)
@@ -0,0 +1,222 @@
+import re
+import operator
+from slipper import NamedList
+from turns import Kind
+# battle phase DSL, compiled once when a battle loads
+# a phase is "conditions" -> "results". conditions: atoms joined by & (and) and | (or), e.g. "start", "t3", "t+2", "e1>=5hp"
+# results: joined by &, e.g. "win", "lose", "move:1,0", "spawn:1,2", "event1", "sys:Hello!"
+
+# raised when a phase can't be compiled
+class PhaseError(ValueError):
+	def __init__(self, index: int, text: str, reason: str):
+		super().__init__(f"Phase {index+1} ({text}): {reason}")
+		self.index= index
+
+# raised when a dialogue line can't be compiled
+class EventError(ValueError):
+	def __init__(self, event: int, line: int, reason: str):
+		super().__init__(f"Event {event+1}, line {line+1}: {reason}")
+		self.event= event
+
+# condition atoms
+TURN= re.compile(r"t(\+?)(\d+)", re.I)
+STAT= re.compile(r"e(\d+)(<=|>=|=|<|>)(\d+)(hp|fp|pow|def|speed|stache)", re.I)
+OPERATORS= {"=": operator.eq, "<": operator.lt, ">": operator.gt, "<=": operator.le, ">=": operator.ge}
+# results
+MOVE= re.compile(r"move:(\d+,\d+|\d{1,2}(?:,\d){5,6})", re.I)
+SPAWN= re.compile(r"spawn:(\d+),(\d+)", re.I)
+EVENT= re.compile(r"event(\d+)", re.I)
+SYS= re.compile(r"sys:(.+)", re.I | re.S)
+TYPES= ["Ground", "Aerial", "Magic"]
+STATS= ["HP", "FP", "POW", "DEF", "SPEED", "STACHE"]
+TARGETS= ["One", "All", "Random"]
+
+# what conditions are checked against, built once per check
+class State:
+	def __init__(self, turn: float, start: bool, lineup: list):
+		self.turn= turn
+		self.start= start
+		# enemy id -> first enemy in the lineup with it
+		self.enemies= {}
+		for guy in lineup:
+			if guy.kind is Kind.ENEMY:
+				self.enemies.setdefault(guy.id, guy)
+
+# compiles one condition atom into (check(state) -> bool, what it depends on)
+# dependencies: "start", "turn", or an enemy id
+def compile_atom(atom: str) -> tuple:
+	if atom.lower() == "start":
+		return lambda state: state.start, "start"
+	match= TURN.fullmatch(atom)
+	if match:
+		comp= int(match[2])
+		if match[1]:
+			if comp == 0:
+				raise ValueError("t+ needs a period of at least 1")
+			# every comp turns
+			return lambda state: state.turn == comp or state.turn % comp == 0, "turn"
+		return lambda state: state.turn == comp, "turn"
+	match= STAT.fullmatch(atom)
+	if match:
+		# enemy numbers are 1-based, ids 0-based
+		id= int(match[1])-1
+		check= OPERATORS[match[2]]
+		value= int(match[3])
+		stat= match[4].upper()
+		def stat_check(state):
+			guy= state.enemies.get(id)
+			return guy is not None and check(int(getattr(guy, stat)), value)
+		return stat_check, id
+	raise ValueError(f'unknown condition "{atom}"')
+
+# compiles one result into a tuple the battle loop runs. indices are checked against the battle
+def compile_result(result: str, battle: dict) -> tuple:
+	enemies= battle.get("enemies", NamedList())
+	# sys messages keep their spacing
+	match= SYS.fullmatch(result.strip())
+	if match:
+		return ("sys", match[1])
+	wResult= result.replace(" ", "")
+	if wResult.lower() == "win":
+		return ("win",)
+	if wResult.lower() == "lose":
+		return ("lose",)
+	match= MOVE.fullmatch(wResult)
+	if match:
+		data= [int(num) for num in match[1].split(",")]
+		if len(data) == 2:
+			# format: [enemy index],[move index]
+			if data[0] >= len(enemies):
+				raise ValueError(f"there's no enemy {data[0]}")
+			if data[1] >= len(enemies[data[0]]["moves"]):
+				raise ValueError(f"{enemies.names[data[0]]} has no move {data[1]}")
+			return ("move", data[0], data[1])
+		# format: [amount(2 digits)],[hits(1 digit)],[type(0/1/2)],[offense(0/1)],[stat(0/1/2/3/4/5)],[target(0/1/2)],(optional)[enemy index]
+		for value, options, name in [(data[2], TYPES, "type"), (data[4], STATS, "stat"), (data[5], TARGETS, "target")]:
+			if value >= len(options):
+				raise ValueError(f"move {name} must be 0-{len(options)-1}")
+		info= {"amount": data[0], "hits": data[1], "type": TYPES[data[2]], "offense": bool(data[3]), "stat": STATS[data[4]], "target": TARGETS[data[5]]}
+		if len(data) == 7:
+			return ("move", info, data[6])
+		return ("move", info, None)
+	match= SPAWN.fullmatch(wResult)
+	if match:
+		if not 0 < int(match[1]) <= len(enemies):
+			raise ValueError(f"there's no enemy {match[1]}")
+		return ("spawn", int(match[1])-1, int(match[2]))
+	match= EVENT.fullmatch(wResult)
+	if match:
+		if not 0 < int(match[1]) <= len(battle.get("dialogue", {}).get("events", [])):
+			raise ValueError(f"there's no event {match[1]}")
+		return ("event", int(match[1])-1)
+	raise ValueError(f'unknown result "{result.strip()}"')
+
+# a compiled phase
+class Phase:
+	def __init__(self, index: int, text: str, groups: list[list], results: list[tuple], deps: set):
+		self.index= index
+		self.text= text
+		# or-groups of and-ed checks
+		self.groups= groups
+		self.results= results
+		# what the conditions read: "start", "turn" and/or enemy ids
+		self.deps= deps
+
+	def met(self, state: State) -> bool:
+		for group in self.groups:
+			for check in group:
+				if not check(state):
+					break
+			else:
+				return True
+		return False
+
+def compile_phase(index: int, conditions: str, results: str, battle: dict) -> Phase:
+	try:
+		groups= []
+		deps= set()
+		for orcondition in conditions.replace(" ", "").split("|"):
+			group= []
+			for atom in orcondition.split("&"):
+				check, dep= compile_atom(atom)
+				group.append(check)
+				deps.add(dep)
+			groups.append(group)
+		compiled= [compile_result(result, battle) for result in str(results).split("&")]
+	except ValueError as e:
+		raise PhaseError(index, conditions, str(e)) from None
+	return Phase(index, conditions, groups, compiled, deps)
+
+# compiles a battle's phases. phases that don't compile are returned as errors and skipped
+def compile_phases(battle: dict) -> tuple[list[Phase], list[PhaseError]]:
+	phases= battle["phases"]
+	compiled= []
+	errors= []
+	for i, (conditions, results) in enumerate(phases.items()):
+		try:
+			compiled.append(compile_phase(i, conditions, results, battle))
+		except PhaseError as e:
+			errors.append(e)
+	return compiled, errors
+
+# dialogue events as ready-to-send (speaker name, avatar url, text) lines. lines that don't compile are returned as errors and skipped
+def compile_events(battle: dict) -> tuple[list[tuple], list[EventError]]:
+	dialogue= battle.get("dialogue", {})
+	chars= dialogue.get("chars", NamedList())
+	events= []
+	errors= []
+	for i, event in enumerate(dialogue.get("events", [])):
+		lines= []
+		for j, line in enumerate(event):
+			# format: [character number (1-based), text]. text with ":" in it may be split into more fields, everything after the number is the text
+			if len(line) < 2:
+				errors.append(EventError(i, j, "there's no dialogue (write [character no.]:[text])"))
+				continue
+			if not str(line[0]).isdecimal() or not 0 < int(line[0]) <= len(chars):
+				errors.append(EventError(i, j, f"there's no character {line[0]}"))
+				continue
+			char= int(line[0])-1
+			lines.append((chars.names[char], chars[char], ":".join(str(part) for part in line[1:])))
+		events.append(tuple(lines))
+	return events, errors
+
+# collections that were out of step when loaded and had to be repaired (see slipper.NamedList.fromLegacy)
+def repairs(battle: dict) -> list[ValueError]:
+	found= [("Phases", battle.get("phases")), ("Enemies", battle.get("enemies")), ("Characters", battle.get("dialogue", {}).get("chars"))]
+	for name, enemy in battle.get("enemies", NamedList()).items():
+		found.append((f"{name}'s moves", enemy.get("moves")))
+	return [ValueError(f"{label}: {collection.repair}") for label, collection in found if isinstance(collection, NamedList) and collection.repair]
+
+# everything in a battle that won't play as written, to warn editors when they save
+def check(battle: dict) -> list[ValueError]:
+	return repairs(battle)+compile_phases(battle)[1]+compile_events(battle)[1]
+
+# phases bucketed by what they depend on. only phases watching something that changed are re-checked
+class PhaseIndex:
+	def __init__(self, phases: list[Phase]= ()):
+		self.phases= phases
+		# dependency -> phases watching it, in phase order
+		self.watchers= {}
+		for phase in phases:
+			for dep in phase.deps:
+				self.watchers.setdefault(dep, []).append(phase)
+		# changes since the last check. None checks every phase (first check)
+		self.dirty= None
+
+	# record that "start", "turn" or enemy ids changed
+	def mark(self, *deps):
+		if self.dirty is not None:
+			self.dirty.update(deps)
+
+	# phases to check now, in phase order. clears the marks
+	def due(self) -> list[Phase]:
+		if self.dirty is None:
+			due= self.phases
+		else:
+			found= {}
+			for dep in self.dirty:
+				for phase in self.watchers.get(dep, ()):
+					found[phase.index]= phase
+			due= [found[i] for i in sorted(found)]
+		self.dirty= set()
+		return due
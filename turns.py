@@ -0,0 +1,69 @@
+import heapq
+import itertools
+from enum import Enum
+# battle turn order: every round, combatants act from highest SPEED down. ties go to whoever joined first (the player)
+
+# combatant kinds
+class Kind(Enum):
+	PLAYER= 0
+	ENEMY= 1
+
+# alive combatants and the current round's turn heap
+class TurnQueue:
+	def __init__(self):
+		# stable combatant ids, in join order
+		self.uids= itertools.count()
+		# uid -> combatant, alive ones only (join order)
+		self.members= {}
+		self.player= None
+		self.enemyCount= 0
+		# (key, tiebreak, uid) for the current round
+		self.heap= []
+		self.seq= itertools.count()
+
+	def __len__(self) -> int:
+		return len(self.members)
+
+	def __contains__(self, guy) -> bool:
+		return guy.uid in self.members
+
+	# add a combatant. ones added mid-round act from the next round
+	def add(self, guy) -> int:
+		guy.uid= next(self.uids)
+		self.members[guy.uid]= guy
+		if guy.kind is Kind.PLAYER:
+			self.player= guy
+		else:
+			self.enemyCount+= 1
+		return guy.uid
+
+	# remove a defeated combatant. its queued turns are skipped when popped
+	def remove(self, guy):
+		if self.members.pop(guy.uid, None) is not None and guy.kind is Kind.ENEMY:
+			self.enemyCount-= 1
+
+	# queue everyone alive for a new round, speeds as they are now
+	def start_round(self):
+		self.heap= [(-guy.SPEED, uid, uid) for uid, guy in self.members.items()]
+		heapq.heapify(self.heap)
+
+	# "One more!": act again before anyone else this round
+	def again(self, guy):
+		heapq.heappush(self.heap, (float("-inf"), next(self.seq), guy.uid))
+
+	# next combatant to act this round, None when the round is over
+	def next(self):
+		while self.heap:
+			uid= heapq.heappop(self.heap)[2]
+			guy= self.members.get(uid)
+			if guy is not None:
+				return guy
+		return None
+
+	# alive enemies in join order
+	def enemies(self) -> list:
+		return [guy for guy in self.members.values() if guy.kind is Kind.ENEMY]
+
+	# alive combatants in join order
+	def lineup(self) -> list:
+		return list(self.members.values())
@@ -0,0 +1,104 @@
+import asyncio
+import hikari
+import timers
+from ports import Choice
+# voting fed by gateway events (reactions) or button presses. messages are never fetched while a vote runs
+
+# variation selector-16, which some clients add to unicode emojis and others don't
+VS16= "\ufe0f"
+
+# key an emoji is matched by: custom emojis by id, unicode by name (without variation selectors)
+def emojiKey(emoji) -> str:
+	if not isinstance(emoji, hikari.Emoji):
+		emoji= hikari.Emoji.parse(str(emoji))
+	if isinstance(emoji, hikari.CustomEmoji):
+		return str(emoji.id)
+	return emoji.name.replace(VS16, "")
+
+# key of a reaction event's emoji, as emojiKey()
+def eventKey(event) -> str:
+	return str(event.emoji_id) if event.emoji_id else event.emoji_name.replace(VS16, "")
+
+# one running vote on a message
+class Vote:
+	def __init__(self, emojis: list, quorum: float= None):
+		self.emojis= list(emojis)
+		self.keys= [emojiKey(emoji) for emoji in self.emojis]
+		# votes one option needs to win early. None waits for the deadline
+		self.quorum= quorum
+		# option index -> ids of users who picked it
+		self.voters= [set() for emoji in self.emojis]
+		self.future= asyncio.get_running_loop().create_future()
+
+	def add(self, user_id: int, key: str):
+		if key in self.keys:
+			i= self.keys.index(key)
+			self.voters[i].add(user_id)
+			if self.quorum is not None and len(self.voters[i]) >= self.quorum:
+				self.finish()
+
+	def remove(self, user_id: int, key: str):
+		if key in self.keys:
+			self.voters[self.keys.index(key)].discard(user_id)
+
+	# button votes: a user's latest pick replaces their earlier one
+	def pick(self, user_id: int, i: int):
+		for voters in self.voters:
+			voters.discard(user_id)
+		self.add(user_id, self.keys[i])
+
+	# the option with the most votes (first one on ties). no votes is Choice()
+	def result(self) -> Choice:
+		max= Choice()
+		for i, voters in enumerate(self.voters):
+			if len(voters) > max.count:
+				max= Choice(i, self.emojis[i], len(voters))
+		return max
+
+	def finish(self):
+		if not self.future.done():
+			self.future.set_result(self.result())
+
+	# wait until quorum or the deadline
+	async def wait(self, timeout: float) -> Choice:
+		end= timers.deadline(timeout)
+		end.add_done_callback(lambda f: self.finish())
+		try:
+			return await self.future
+		finally:
+			end.cancel()
+
+# open votes, keyed by message id
+class VoteCollector:
+	def __init__(self):
+		self.votes= {}
+
+	# start collecting before reactions are added, so early votes aren't missed
+	def open(self, message_id: int, emojis: list, quorum: float= None) -> Vote:
+		vote= Vote(emojis, quorum)
+		self.votes[int(message_id)]= vote
+		return vote
+
+	# wait until quorum or the deadline, then stop collecting
+	async def wait(self, message_id: int, timeout: float) -> Choice:
+		try:
+			return await self.votes[int(message_id)].wait(timeout)
+		finally:
+			self.votes.pop(int(message_id), None)
+
+	def on_add(self, event: hikari.GuildReactionAddEvent):
+		vote= self.votes.get(event.message_id)
+		if vote and not self.is_me(event):
+			vote.add(event.user_id, eventKey(event))
+
+	def on_remove(self, event: hikari.GuildReactionDeleteEvent):
+		vote= self.votes.get(event.message_id)
+		if vote and not self.is_me(event):
+			vote.remove(event.user_id, eventKey(event))
+
+	# the bot's own reactions aren't votes
+	def is_me(self, event) -> bool:
+		me= event.app.get_me()
+		return me is not None and event.user_id == me.id
+
+collector= VoteCollector()